@@ -1,11 +1,19 @@
-import random
+import csv
+import io
 import datetime
-from typing import List, Dict, Any
-from faker import Faker
+from typing import Iterator, List, Dict, Any, Optional
 
-class APInvoiceGenerator:
-    def __init__(self):
-        self.fake = Faker()
+import numpy as np
+import pandas as pd
+
+from generator_base import SeededGenerator, company_name_pool, lines_dataframe
+
+class APInvoiceGenerator(SeededGenerator):
+    # Supplier names are drawn from a fixed pool; Faker's company() is slow per call
+    COMPANY_POOL_SIZE = 1024
+    
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(seed)
         self.invoice_types = ['STANDARD', 'PREPAYMENT', 'EXPENSE_REPORT']
         self.business_units = ['US1 Business Unit', 'UK Business Unit', 'CA Business Unit']
         self.currencies = ['USD', 'CAD', 'EUR', 'GBP']
@@ -15,63 +23,103 @@ class APInvoiceGenerator:
             'Utilities', 'Rent', 'Insurance', 'Maintenance'
         ]
         
+    @property
+    def company_names(self) -> List[str]:
+        return company_name_pool(self.COMPANY_POOL_SIZE)
+    
     def generate_ap_invoices(self, accounts: List[Dict[str, Any]], 
                            invoices_per_account: int = 3,
                            lines_per_invoice: int = 2,
                            date_range_days: int = 30) -> List[Dict[str, Any]]:
         """Generate AP invoices for Oracle Fusion"""
+        return list(self.iter_ap_invoices(accounts, invoices_per_account, lines_per_invoice, date_range_days))
+    
+    def iter_ap_invoices(self, accounts: List[Dict[str, Any]], 
+                         invoices_per_account: int = 3,
+                         lines_per_invoice: int = 2,
+                         date_range_days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Yield AP invoices one at a time, so large runs need not be held in memory"""
         
-        invoices = []
         base_date = datetime.datetime.now()
         
+        # Invoice and due dates fall within a fixed window around today, so format each
+        # day of it once instead of calling strftime twice per invoice
+        date_strings = {
+            days: (base_date + datetime.timedelta(days=days)).strftime('%Y/%m/%d')
+            for days in range(-date_range_days, 46)
+        }
+        
+        # Invoice numbers and id suffixes depend only on the position, so format them once
+        invoice_numbers = [f"INV{i:06d}" for i in range(1, invoices_per_account + 1)]
+        invoice_id_suffixes = [f"-{i:03d}" for i in range(1, invoices_per_account + 1)]
+        
+        company_names = self.company_names
+        
         for account in accounts:
             account_name = account.get('account_name', 'Unknown Account')
             currency = account.get('currency', 'USD')
+            invoice_id_prefix = f"INV-{account_name[:3].upper()}"
+            
+            # Draw every line field for all of the account's invoices in one call each,
+            # shaped (invoice, line), instead of several random calls per line
+            line_shape = (invoices_per_account, lines_per_invoice)
+            # Amounts are drawn and summed in integer cents and only turned into floats here,
+            # so invoice totals are exact sums of their lines
+            line_cents = self.rng.integers(10000, 500000, size=line_shape, endpoint=True)
+            line_quantities = self.rng.integers(1, 10, size=line_shape, endpoint=True)
+            amounts = (line_cents / 100).tolist()
+            quantities = line_quantities.tolist()
+            unit_prices = ((line_cents + line_quantities // 2) // line_quantities / 100).tolist()
+            invoice_amounts = (line_cents.sum(axis=1) / 100).tolist()
+            description_indexes = self.rng.integers(len(self.expense_categories), size=line_shape).tolist()
+            category_indexes = self.rng.integers(len(self.expense_categories), size=line_shape).tolist()
+            gl_accounts = self.rng.integers(1000, 9999, size=line_shape, endpoint=True).tolist()
+            tax_exempt = (self.rng.random(line_shape) > 0.3).tolist()
+            
+            # Header fields, one value per invoice
+            invoice_offsets = self.rng.integers(0, date_range_days, size=invoices_per_account, endpoint=True).tolist()
+            due_days = self.rng.integers(15, 45, size=invoices_per_account, endpoint=True).tolist()
+            type_indexes = self.rng.integers(len(self.invoice_types), size=invoices_per_account).tolist()
+            unit_indexes = self.rng.integers(len(self.business_units), size=invoices_per_account).tolist()
+            company_indexes = self.rng.integers(len(company_names), size=invoices_per_account).tolist()
+            supplier_numbers = self.rng.integers(1000, 9999, size=invoices_per_account, endpoint=True).tolist()
             
             for i in range(invoices_per_account):
                 # Generate invoice header
-                invoice_date = base_date - datetime.timedelta(days=random.randint(0, date_range_days))
-                due_date = invoice_date + datetime.timedelta(days=random.randint(15, 45))
+                invoice_offset = -invoice_offsets[i]
+                due_offset = invoice_offset + due_days[i]
                 
                 invoice_header = {
-                    'InvoiceId': f"INV-{account_name[:3].upper()}-{i+1:03d}",
-                    'InvoiceNumber': f"INV{i+1:06d}",
-                    'InvoiceDate': invoice_date.strftime('%Y/%m/%d'),
-                    'DueDate': due_date.strftime('%Y/%m/%d'),
-                    'InvoiceType': random.choice(self.invoice_types),
-                    'BusinessUnit': random.choice(self.business_units),
+                    'InvoiceId': invoice_id_prefix + invoice_id_suffixes[i],
+                    'InvoiceNumber': invoice_numbers[i],
+                    'InvoiceDate': date_strings[invoice_offset],
+                    'DueDate': date_strings[due_offset],
+                    'InvoiceType': self.invoice_types[type_indexes[i]],
+                    'BusinessUnit': self.business_units[unit_indexes[i]],
                     'Currency': currency,
-                    'SupplierName': self.fake.company(),
-                    'SupplierNumber': f"SUP{random.randint(1000, 9999)}",
-                    'InvoiceAmount': 0.0,  # Will be calculated from lines
+                    'SupplierName': company_names[company_indexes[i]],
+                    'SupplierNumber': f"SUP{supplier_numbers[i]}",
+                    'InvoiceAmount': invoice_amounts[i],
                     'Status': 'PENDING_APPROVAL',
                     'Description': f"Demo AP Invoice {i+1} for {account_name}"
                 }
                 
-                # Generate invoice lines
-                invoice_lines = []
-                total_amount = 0.0
-                
-                for j in range(lines_per_invoice):
-                    line_amount = random.uniform(100, 5000)
-                    total_amount += line_amount
-                    
-                    line = {
+                # Generate invoice lines from the account's pre-drawn line arrays
+                invoice_lines = [
+                    {
                         'LineNumber': j + 1,
                         'LineType': 'ITEM',
-                        'Amount': round(line_amount, 2),
-                        'Quantity': random.randint(1, 10),
-                        'UnitPrice': round(line_amount / random.randint(1, 10), 2),
-                        'Description': random.choice(self.expense_categories),
-                        'ExpenseCategory': random.choice(self.expense_categories),
-                        'GLAccount': f"GL{random.randint(1000, 9999)}",
-                        'TaxCode': 'TAX_EXEMPT' if random.random() > 0.3 else 'STANDARD_TAX',
+                        'Amount': amounts[i][j],
+                        'Quantity': quantities[i][j],
+                        'UnitPrice': unit_prices[i][j],
+                        'Description': self.expense_categories[description_indexes[i][j]],
+                        'ExpenseCategory': self.expense_categories[category_indexes[i][j]],
+                        'GLAccount': f"GL{gl_accounts[i][j]}",
+                        'TaxCode': 'TAX_EXEMPT' if tax_exempt[i][j] else 'STANDARD_TAX',
                         'LineStatus': 'PENDING'
                     }
-                    invoice_lines.append(line)
-                
-                # Update invoice amount
-                invoice_header['InvoiceAmount'] = round(total_amount, 2)
+                    for j in range(lines_per_invoice)
+                ]
                 
                 # Combine header and lines
                 invoice = {
@@ -79,9 +127,11 @@ class APInvoiceGenerator:
                     'lines': invoice_lines
                 }
                 
-                invoices.append(invoice)
-        
-        return invoices
+                yield invoice
+    
+    def generate_lines_dataframe(self, invoices: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build one DataFrame of every invoice line; `df.loc[i:i]` gives the lines of invoice i"""
+        return lines_dataframe(invoices, index_name='invoice')
     
     def generate_csv_content(self, invoices: List[Dict[str, Any]]) -> str:
         """Generate CSV content for AP invoice lines interface"""
@@ -89,18 +139,45 @@ class APInvoiceGenerator:
             return ""
         
         # CSV header based on ApInvoiceLinesInterface.csv
-        csv_lines = [
-            'InvoiceId,LineNumber,LineType,Amount,Quantity,UnitPrice,Description,ExpenseCategory,GLAccount,TaxCode,LineStatus,InvoiceDate,DueDate,InvoiceType,BusinessUnit,Currency,SupplierName,SupplierNumber,InvoiceAmount,Status'
-        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow([
+            'InvoiceId', 'LineNumber', 'LineType', 'Amount', 'Quantity', 'UnitPrice',
+            'Description', 'ExpenseCategory', 'GLAccount', 'TaxCode', 'LineStatus', 'InvoiceDate',
+            'DueDate', 'InvoiceType', 'BusinessUnit', 'Currency', 'SupplierName', 'SupplierNumber',
+            'InvoiceAmount', 'Status'
+        ])
         
         # CSV data rows
         for invoice in invoices:
             header = invoice['header']
-            for line in invoice['lines']:
-                csv_line = f"{header['InvoiceId']},{line['LineNumber']},{line['LineType']},{line['Amount']},{line['Quantity']},{line['UnitPrice']},{line['Description']},{line['ExpenseCategory']},{line['GLAccount']},{line['TaxCode']},{line['LineStatus']},{header['InvoiceDate']},{header['DueDate']},{header['InvoiceType']},{header['BusinessUnit']},{header['Currency']},{header['SupplierName']},{header['SupplierNumber']},{header['InvoiceAmount']},{header['Status']}"
-                csv_lines.append(csv_line)
+            writer.writerows(
+                (
+                    header['InvoiceId'],
+                    line['LineNumber'],
+                    line['LineType'],
+                    line['Amount'],
+                    line['Quantity'],
+                    line['UnitPrice'],
+                    line['Description'],
+                    line['ExpenseCategory'],
+                    line['GLAccount'],
+                    line['TaxCode'],
+                    line['LineStatus'],
+                    header['InvoiceDate'],
+                    header['DueDate'],
+                    header['InvoiceType'],
+                    header['BusinessUnit'],
+                    header['Currency'],
+                    header['SupplierName'],
+                    header['SupplierNumber'],
+                    header['InvoiceAmount'],
+                    header['Status']
+                )
+                for line in invoice['lines']
+            )
         
-        return '\n'.join(csv_lines)
+        return buffer.getvalue()
     
     def generate_oracle_fusion_format(self, invoices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate Oracle Fusion API format for posting AP invoices"""
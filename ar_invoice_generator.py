@@ -1,11 +1,19 @@
-import random
+import csv
+import io
 import datetime
-from typing import List, Dict, Any
-from faker import Faker
+from typing import Iterator, List, Dict, Any, Optional
 
-class ARInvoiceGenerator:
-    def __init__(self):
-        self.fake = Faker()
+import numpy as np
+import pandas as pd
+
+from generator_base import SeededGenerator, company_name_pool, lines_dataframe
+
+class ARInvoiceGenerator(SeededGenerator):
+    # Customer names are drawn from a fixed pool; Faker's company() is slow per call
+    COMPANY_POOL_SIZE = 1024
+    
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(seed)
         self.invoice_types = ['STANDARD', 'CREDIT_MEMO', 'DEBIT_MEMO', 'ADVANCE']
         self.business_units = ['US1 Business Unit', 'UK Business Unit', 'CA Business Unit']
         self.currencies = ['USD', 'CAD', 'EUR', 'GBP']
@@ -16,65 +24,107 @@ class ARInvoiceGenerator:
             'Custom Development'
         ]
         self.payment_terms = ['NET30', 'NET60', 'NET90', 'DUE_ON_RECEIPT', 'NET15']
+        self.payment_methods = ['CHECK', 'WIRE', 'ACH', 'CREDIT_CARD']
         
+    @property
+    def company_names(self) -> List[str]:
+        return company_name_pool(self.COMPANY_POOL_SIZE)
+    
     def generate_ar_invoices(self, accounts: List[Dict[str, Any]], 
                            invoices_per_account: int = 3,
                            lines_per_invoice: int = 2,
                            date_range_days: int = 30) -> List[Dict[str, Any]]:
         """Generate AR invoices for Oracle Fusion"""
+        return list(self.iter_ar_invoices(accounts, invoices_per_account, lines_per_invoice, date_range_days))
+    
+    def iter_ar_invoices(self, accounts: List[Dict[str, Any]], 
+                         invoices_per_account: int = 3,
+                         lines_per_invoice: int = 2,
+                         date_range_days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Yield AR invoices one at a time, so large runs need not be held in memory"""
         
-        invoices = []
         base_date = datetime.datetime.now()
         
+        # Invoice and due dates fall within a fixed window around today, so format each
+        # day of it once instead of calling strftime twice per invoice
+        date_strings = {
+            days: (base_date + datetime.timedelta(days=days)).strftime('%Y/%m/%d')
+            for days in range(-date_range_days, 46)
+        }
+        
+        # Invoice numbers and id suffixes depend only on the position, so format them once
+        invoice_numbers = [f"AR{i:06d}" for i in range(1, invoices_per_account + 1)]
+        invoice_id_suffixes = [f"-{i:03d}" for i in range(1, invoices_per_account + 1)]
+        
+        company_names = self.company_names
+        
         for account in accounts:
             account_name = account.get('account_name', 'Unknown Account')
             currency = account.get('currency', 'USD')
+            invoice_id_prefix = f"AR-{account_name[:3].upper()}"
+            
+            # Draw every line field for all of the account's invoices in one call each,
+            # shaped (invoice, line), instead of several random calls per line
+            line_shape = (invoices_per_account, lines_per_invoice)
+            # Amounts are drawn and summed in integer cents and only turned into floats here,
+            # so invoice totals are exact sums of their lines
+            line_cents = self.rng.integers(50000, 1000000, size=line_shape, endpoint=True)
+            line_quantities = self.rng.integers(1, 20, size=line_shape, endpoint=True)
+            amounts = (line_cents / 100).tolist()
+            quantities = line_quantities.tolist()
+            unit_prices = ((line_cents + line_quantities // 2) // line_quantities / 100).tolist()
+            invoice_amounts = (line_cents.sum(axis=1) / 100).tolist()
+            description_indexes = self.rng.integers(len(self.revenue_categories), size=line_shape).tolist()
+            category_indexes = self.rng.integers(len(self.revenue_categories), size=line_shape).tolist()
+            gl_accounts = self.rng.integers(2000, 9999, size=line_shape, endpoint=True).tolist()
+            tax_exempt = (self.rng.random(line_shape) > 0.3).tolist()
+            
+            # Header fields, one value per invoice
+            invoice_offsets = self.rng.integers(0, date_range_days, size=invoices_per_account, endpoint=True).tolist()
+            due_days = self.rng.integers(15, 45, size=invoices_per_account, endpoint=True).tolist()
+            type_indexes = self.rng.integers(len(self.invoice_types), size=invoices_per_account).tolist()
+            unit_indexes = self.rng.integers(len(self.business_units), size=invoices_per_account).tolist()
+            company_indexes = self.rng.integers(len(company_names), size=invoices_per_account).tolist()
+            customer_numbers = self.rng.integers(1000, 9999, size=invoices_per_account, endpoint=True).tolist()
+            terms_indexes = self.rng.integers(len(self.payment_terms), size=invoices_per_account).tolist()
             
             for i in range(invoices_per_account):
                 # Generate invoice header
-                invoice_date = base_date - datetime.timedelta(days=random.randint(0, date_range_days))
-                due_date = invoice_date + datetime.timedelta(days=random.randint(15, 45))
+                invoice_offset = -invoice_offsets[i]
+                due_offset = invoice_offset + due_days[i]
                 
                 invoice_header = {
-                    'InvoiceId': f"AR-{account_name[:3].upper()}-{i+1:03d}",
-                    'InvoiceNumber': f"AR{i+1:06d}",
-                    'InvoiceDate': invoice_date.strftime('%Y/%m/%d'),
-                    'DueDate': due_date.strftime('%Y/%m/%d'),
-                    'InvoiceType': random.choice(self.invoice_types),
-                    'BusinessUnit': random.choice(self.business_units),
+                    'InvoiceId': invoice_id_prefix + invoice_id_suffixes[i],
+                    'InvoiceNumber': invoice_numbers[i],
+                    'InvoiceDate': date_strings[invoice_offset],
+                    'DueDate': date_strings[due_offset],
+                    'InvoiceType': self.invoice_types[type_indexes[i]],
+                    'BusinessUnit': self.business_units[unit_indexes[i]],
                     'Currency': currency,
-                    'CustomerName': self.fake.company(),
-                    'CustomerNumber': f"CUST{random.randint(1000, 9999)}",
-                    'InvoiceAmount': 0.0,  # Will be calculated from lines
+                    'CustomerName': company_names[company_indexes[i]],
+                    'CustomerNumber': f"CUST{customer_numbers[i]}",
+                    'InvoiceAmount': invoice_amounts[i],
                     'Status': 'PENDING_APPROVAL',
-                    'PaymentTerms': random.choice(self.payment_terms),
+                    'PaymentTerms': self.payment_terms[terms_indexes[i]],
                     'Description': f"Demo AR Invoice {i+1} for {account_name}"
                 }
                 
-                # Generate invoice lines
-                invoice_lines = []
-                total_amount = 0.0
-                
-                for j in range(lines_per_invoice):
-                    line_amount = random.uniform(500, 10000)
-                    total_amount += line_amount
-                    
-                    line = {
+                # Generate invoice lines from the account's pre-drawn line arrays
+                invoice_lines = [
+                    {
                         'LineNumber': j + 1,
                         'LineType': 'ITEM',
-                        'Amount': round(line_amount, 2),
-                        'Quantity': random.randint(1, 20),
-                        'UnitPrice': round(line_amount / random.randint(1, 20), 2),
-                        'Description': random.choice(self.revenue_categories),
-                        'RevenueCategory': random.choice(self.revenue_categories),
-                        'GLAccount': f"GL{random.randint(2000, 9999)}",  # Revenue accounts
-                        'TaxCode': 'TAX_EXEMPT' if random.random() > 0.3 else 'STANDARD_TAX',
+                        'Amount': amounts[i][j],
+                        'Quantity': quantities[i][j],
+                        'UnitPrice': unit_prices[i][j],
+                        'Description': self.revenue_categories[description_indexes[i][j]],
+                        'RevenueCategory': self.revenue_categories[category_indexes[i][j]],
+                        'GLAccount': f"GL{gl_accounts[i][j]}",  # Revenue accounts
+                        'TaxCode': 'TAX_EXEMPT' if tax_exempt[i][j] else 'STANDARD_TAX',
                         'LineStatus': 'PENDING'
                     }
-                    invoice_lines.append(line)
-                
-                # Update invoice amount
-                invoice_header['InvoiceAmount'] = round(total_amount, 2)
+                    for j in range(lines_per_invoice)
+                ]
                 
                 # Combine header and lines
                 invoice = {
@@ -82,42 +132,53 @@ class ARInvoiceGenerator:
                     'lines': invoice_lines
                 }
                 
-                invoices.append(invoice)
-        
-        return invoices
+                yield invoice
     
     def generate_receipts(self, invoices: List[Dict[str, Any]], 
                          receipt_percentage: float = 0.7) -> List[Dict[str, Any]]:
         """Generate receipts for AR invoices"""
         
         receipts = []
+        # Receipt dates repeat heavily across invoices, so format each day once
+        receipt_date_strings = {}
         
-        for invoice in invoices:
+        # Draw every receipt field for all invoices up front, one call each
+        count = len(invoices)
+        has_receipt = (self.rng.random(count) <= receipt_percentage).tolist()
+        receipt_day_fractions = self.rng.random(count).tolist()
+        receipt_numbers = self.rng.integers(1000, 9999, size=count, endpoint=True).tolist()
+        method_indexes = self.rng.integers(len(self.payment_methods), size=count).tolist()
+        reference_numbers = self.rng.integers(100, 999, size=count, endpoint=True).tolist()
+        
+        for k, invoice in enumerate(invoices):
             # 70% of invoices get receipts by default
-            if random.random() <= receipt_percentage:
+            if has_receipt[k]:
                 header = invoice['header']
                 
                 # Generate receipt date (after invoice date, before due date)
-                invoice_date = datetime.datetime.strptime(header['InvoiceDate'], '%Y/%m/%d')
-                due_date = datetime.datetime.strptime(header['DueDate'], '%Y/%m/%d')
+                invoice_date = datetime.date.fromisoformat(header['InvoiceDate'].replace('/', '-'))
+                due_date = datetime.date.fromisoformat(header['DueDate'].replace('/', '-'))
                 
                 # Receipt date between invoice and due date
                 days_between = (due_date - invoice_date).days
-                receipt_days = random.randint(0, days_between)
+                receipt_days = int(receipt_day_fractions[k] * (days_between + 1))
                 receipt_date = invoice_date + datetime.timedelta(days=receipt_days)
+                receipt_date_string = receipt_date_strings.get(receipt_date)
+                if receipt_date_string is None:
+                    receipt_date_string = receipt_date_strings[receipt_date] = receipt_date.strftime('%Y/%m/%d')
                 
                 receipt = {
                     'ReceiptId': f"RCPT-{header['InvoiceId']}",
-                    'ReceiptNumber': f"RCPT{random.randint(1000, 9999)}",
+                    'ReceiptNumber': f"RCPT{receipt_numbers[k]}",
                     'InvoiceId': header['InvoiceId'],
                     'InvoiceNumber': header['InvoiceNumber'],
                     'CustomerName': header['CustomerName'],
                     'CustomerNumber': header['CustomerNumber'],
-                    'ReceiptDate': receipt_date.strftime('%Y/%m/%d'),
+                    'ReceiptDate': receipt_date_string,
                     'Amount': header['InvoiceAmount'],
                     'Currency': header['Currency'],
-                    'PaymentMethod': random.choice(['CHECK', 'WIRE', 'ACH', 'CREDIT_CARD']),
-                    'Reference': f"PAY-{header['CustomerNumber']}-{random.randint(100, 999)}",
+                    'PaymentMethod': self.payment_methods[method_indexes[k]],
+                    'Reference': f"PAY-{header['CustomerNumber']}-{reference_numbers[k]}",
                     'Status': 'APPLIED',
                     'BusinessUnit': header['BusinessUnit']
                 }
@@ -126,24 +187,56 @@ class ARInvoiceGenerator:
         
         return receipts
     
+    def generate_lines_dataframe(self, invoices: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build one DataFrame of every invoice line; `df.loc[i:i]` gives the lines of invoice i"""
+        return lines_dataframe(invoices, index_name='invoice')
+    
     def generate_csv_content(self, invoices: List[Dict[str, Any]]) -> str:
         """Generate CSV content for AR invoice lines interface"""
         if not invoices:
             return ""
         
         # CSV header for AR invoices
-        csv_lines = [
-            'InvoiceId,LineNumber,LineType,Amount,Quantity,UnitPrice,Description,RevenueCategory,GLAccount,TaxCode,LineStatus,InvoiceDate,DueDate,InvoiceType,BusinessUnit,Currency,CustomerName,CustomerNumber,InvoiceAmount,Status,PaymentTerms'
-        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow([
+            'InvoiceId', 'LineNumber', 'LineType', 'Amount', 'Quantity', 'UnitPrice',
+            'Description', 'RevenueCategory', 'GLAccount', 'TaxCode', 'LineStatus', 'InvoiceDate',
+            'DueDate', 'InvoiceType', 'BusinessUnit', 'Currency', 'CustomerName', 'CustomerNumber',
+            'InvoiceAmount', 'Status', 'PaymentTerms'
+        ])
         
         # CSV data rows
         for invoice in invoices:
             header = invoice['header']
-            for line in invoice['lines']:
-                csv_line = f"{header['InvoiceId']},{line['LineNumber']},{line['LineType']},{line['Amount']},{line['Quantity']},{line['UnitPrice']},{line['Description']},{line['RevenueCategory']},{line['GLAccount']},{line['TaxCode']},{line['LineStatus']},{header['InvoiceDate']},{header['DueDate']},{header['InvoiceType']},{header['BusinessUnit']},{header['Currency']},{header['CustomerName']},{header['CustomerNumber']},{header['InvoiceAmount']},{header['Status']},{header['PaymentTerms']}"
-                csv_lines.append(csv_line)
+            writer.writerows(
+                (
+                    header['InvoiceId'],
+                    line['LineNumber'],
+                    line['LineType'],
+                    line['Amount'],
+                    line['Quantity'],
+                    line['UnitPrice'],
+                    line['Description'],
+                    line['RevenueCategory'],
+                    line['GLAccount'],
+                    line['TaxCode'],
+                    line['LineStatus'],
+                    header['InvoiceDate'],
+                    header['DueDate'],
+                    header['InvoiceType'],
+                    header['BusinessUnit'],
+                    header['Currency'],
+                    header['CustomerName'],
+                    header['CustomerNumber'],
+                    header['InvoiceAmount'],
+                    header['Status'],
+                    header['PaymentTerms']
+                )
+                for line in invoice['lines']
+            )
         
-        return '\n'.join(csv_lines)
+        return buffer.getvalue()
     
     def generate_receipts_csv_content(self, receipts: List[Dict[str, Any]]) -> str:
         """Generate CSV content for AR receipts"""
@@ -151,16 +244,35 @@ class ARInvoiceGenerator:
             return ""
         
         # CSV header for receipts
-        csv_lines = [
-            'ReceiptId,ReceiptNumber,InvoiceId,InvoiceNumber,CustomerName,CustomerNumber,ReceiptDate,Amount,Currency,PaymentMethod,Reference,Status,BusinessUnit'
-        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow([
+            'ReceiptId', 'ReceiptNumber', 'InvoiceId', 'InvoiceNumber', 'CustomerName',
+            'CustomerNumber', 'ReceiptDate', 'Amount', 'Currency', 'PaymentMethod', 'Reference',
+            'Status', 'BusinessUnit'
+        ])
         
         # CSV data rows
-        for receipt in receipts:
-            csv_line = f"{receipt['ReceiptId']},{receipt['ReceiptNumber']},{receipt['InvoiceId']},{receipt['InvoiceNumber']},{receipt['CustomerName']},{receipt['CustomerNumber']},{receipt['ReceiptDate']},{receipt['Amount']},{receipt['Currency']},{receipt['PaymentMethod']},{receipt['Reference']},{receipt['Status']},{receipt['BusinessUnit']}"
-            csv_lines.append(csv_line)
+        writer.writerows(
+            (
+                receipt['ReceiptId'],
+                receipt['ReceiptNumber'],
+                receipt['InvoiceId'],
+                receipt['InvoiceNumber'],
+                receipt['CustomerName'],
+                receipt['CustomerNumber'],
+                receipt['ReceiptDate'],
+                receipt['Amount'],
+                receipt['Currency'],
+                receipt['PaymentMethod'],
+                receipt['Reference'],
+                receipt['Status'],
+                receipt['BusinessUnit']
+            )
+            for receipt in receipts
+        )
         
-        return '\n'.join(csv_lines)
+        return buffer.getvalue()
     
     def generate_oracle_fusion_format(self, invoices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate Oracle Fusion API format for posting AR invoices"""
@@ -1,9 +1,20 @@
 import datetime
-import random
 from typing import List, Dict, Any
 
-class BAI2Generator:
+from generator_base import SeededGenerator
+
+class BAI2Generator(SeededGenerator):
+    # BAI2 transaction codes - more realistic codes
+    CREDIT_CODES = ('165', '195', '200', '210', '220')  # Different credit types
+    DEBIT_CODES = ('475', '485', '490', '500', '510')  # Different debit types
+    
+    # Record layouts, parsed once as bound str.format methods instead of per-record f-strings
+    ACCOUNT_HEADER = "02,{},,{},,".format
+    TRANSACTION_RECORD = "03,{},{},{:.2f},{},,".format
+    ACCOUNT_TRAILER = "49,{:.2f},{:.2f},,".format
+    
     def __init__(self):
+        super().__init__()
         self.record_types = {
             '01': 'Group Header',
             '02': 'Account Identifier', 
@@ -28,6 +39,12 @@ class BAI2Generator:
         file_header = self._create_file_header()
         bai2_content.append(file_header)
         
+        # Bucket pre-generated transactions by account in a single pass
+        transactions_by_account = {}
+        if pre_generated_transactions:
+            for transaction in pre_generated_transactions:
+                transactions_by_account.setdefault(transaction.get('account_id'), []).append(transaction)
+        
         # For each account
         for account in accounts:
             try:
@@ -48,7 +65,7 @@ class BAI2Generator:
                 # Get transactions for this account
                 if pre_generated_transactions:
                     # Use pre-generated transactions for this account
-                    account_transactions = [t for t in pre_generated_transactions if t.get('account_id') == account.get('account_id')]
+                    account_transactions = transactions_by_account.get(account.get('account_id'), [])
                 else:
                     # Fallback to generating transactions (for backward compatibility)
                     account_transactions = self._generate_transactions_for_account(
@@ -83,7 +100,7 @@ class BAI2Generator:
     def _create_account_header(self, account: Dict[str, Any]) -> str:
         """Create BAI2 account header record"""
         account_number = account.get('account_number_for_transactions', account.get('account_number', ''))
-        return f"02,{account_number},,{account.get('currency', 'USD')},,"
+        return self.ACCOUNT_HEADER(account_number, account.get('currency', 'USD'))
     
     def _create_transaction_record(self, transaction: Dict[str, Any]) -> str:
         """Create BAI2 transaction detail record"""
@@ -95,9 +112,8 @@ class BAI2Generator:
             date_str = transaction.get('date', '01/01/24')
             if '-' in date_str:
                 # Parse YYYY-MM-DD format
-                from datetime import datetime
                 try:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+                    date_obj = datetime.datetime.strptime(date_str, '%Y-%m-%d')
                     date_formatted = date_obj.strftime('%d/%m/%y')
                 except ValueError:
                     # Fallback to default date
@@ -106,22 +122,16 @@ class BAI2Generator:
                 # Assume already in DD/MM/YY format
                 date_formatted = date_str
             
-            # BAI2 transaction codes - more realistic codes
-            if transaction_type == 'Credit':
-                # Various credit codes
-                credit_codes = ['165', '195', '200', '210', '220']  # Different credit types
-                code = credit_codes[hash(str(transaction.get('description', ''))) % len(credit_codes)]
-            else:
-                # Various debit codes
-                debit_codes = ['475', '485', '490', '500', '510']  # Different debit types
-                code = debit_codes[hash(str(transaction.get('description', ''))) % len(debit_codes)]
+            # BAI2 transaction codes
+            codes = self.CREDIT_CODES if transaction_type == 'Credit' else self.DEBIT_CODES
+            code = codes[hash(str(transaction.get('description', ''))) % len(codes)]
             
             # Truncate description if too long for BAI2 format
             description = transaction.get('description', 'Demo transaction')
             if len(description) > 30:
                 description = description[:27] + "..."
             
-            return f"03,{date_formatted},{code},{amount:.2f},{description},,"
+            return self.TRANSACTION_RECORD(date_formatted, code, amount, description)
             
         except Exception as e:
             # Return a safe default transaction record
@@ -130,7 +140,7 @@ class BAI2Generator:
     
     def _create_account_trailer(self, account: Dict[str, Any], opening_balance: float, closing_balance: float) -> str:
         """Create BAI2 account trailer record"""
-        return f"49,{opening_balance:.2f},{closing_balance:.2f},,"
+        return self.ACCOUNT_TRAILER(opening_balance, closing_balance)
     
     def _create_file_trailer(self) -> str:
         """Create BAI2 file trailer record"""
@@ -146,6 +156,11 @@ class BAI2Generator:
         if opening_balance is None or target_closing_balance is None:
             raise ValueError(f"Missing balance data for account {account.get('account_id', 'unknown')}")
         
+        # Draw every candidate amount in one call; only the target-seeking min() below
+        # depends on the running balance and has to stay sequential
+        credit_draws = self.rng.uniform(100, 5000, size=count).tolist()
+        debit_draws = self.rng.uniform(100, 3000, size=count).tolist()
+        
         for i in range(count):
             # Calculate target amount to reach closing balance
             remaining_transactions = count - i - 1
@@ -157,10 +172,10 @@ class BAI2Generator:
             # Generate transaction
             if target_amount > 0:
                 transaction_type = 'Credit'
-                amount = min(abs(target_amount), random.uniform(100, 5000))
+                amount = min(abs(target_amount), credit_draws[i])
             else:
                 transaction_type = 'Debit'
-                amount = min(abs(target_amount), random.uniform(100, 3000))
+                amount = min(abs(target_amount), debit_draws[i])
             
             transaction = {
                 'date': f"{(i+1):02d}/01/24",
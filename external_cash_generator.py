@@ -1,9 +1,24 @@
-import random
+import csv
+import io
 import datetime
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any, Optional
 
-class ExternalCashGenerator:
-    def __init__(self):
+import numpy as np
+import pandas as pd
+
+from generator_base import SeededGenerator
+
+class ExternalCashGenerator(SeededGenerator):
+    # Amount range per currency in whole units; anything else falls back to the GBP range
+    AMOUNT_RANGES = {
+        'USD': (100, 10000),
+        'CAD': (150, 15000),
+        'EUR': (80, 8000),
+        'GBP': (70, 7000)
+    }
+    
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(seed)
         self.transaction_types = ['CHK', 'EFT', 'MSC', 'WIR', 'ACH']
         self.business_units = ['US1 Business Unit', 'UK Business Unit', 'CA Business Unit']
         self.currencies = ['USD', 'CAD', 'EUR', 'GBP']
@@ -12,51 +27,56 @@ class ExternalCashGenerator:
                                     transactions_per_account: int = 5,
                                     date_range_days: int = 30) -> List[Dict[str, Any]]:
         """Generate external cash transactions for Oracle Fusion"""
+        return list(self.iter_external_transactions(accounts, transactions_per_account, date_range_days))
+    
+    def iter_external_transactions(self, accounts: List[Dict[str, Any]], 
+                                   transactions_per_account: int = 5,
+                                   date_range_days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Yield external cash transactions one at a time, so large runs need not be held in memory"""
         
-        transactions = []
+        count = transactions_per_account
         base_date = datetime.datetime.now()
         
+        # Everything that depends only on the day offset or the position is formatted once
+        date_strings = [
+            (base_date - datetime.timedelta(days=days_offset)).strftime('%m/%d/%Y')
+            for days_offset in range(date_range_days + 1)
+        ]
+        reference_suffixes = [f"{i+1:02d}{chr(65 + i % 26)}" for i in range(count)]
+        
         for account in accounts:
             account_name = account.get('account_name', 'Unknown Account')
             currency = account.get('currency', 'USD')
+            reference_prefix = f"EXT-{account_name[:3]}-"
             
-            for i in range(transactions_per_account):
-                # Generate random transaction date within range
-                days_offset = random.randint(0, date_range_days)
-                transaction_date = base_date - datetime.timedelta(days=days_offset)
-                
-                # Generate transaction
-                transaction = {
+            # Draw every random field of the account's transactions in one call each
+            low, high = self.AMOUNT_RANGES.get(currency, self.AMOUNT_RANGES['GBP'])
+            cents = self.rng.integers(low * 100, high * 100, size=count, endpoint=True)
+            # 70% positive (credits), 30% negative (debits)
+            amounts = (np.where(self.rng.random(count) > 0.3, cents, -cents) / 100).tolist()
+            days_offsets = self.rng.integers(0, date_range_days, size=count, endpoint=True).tolist()
+            type_indexes = self.rng.integers(len(self.transaction_types), size=count).tolist()
+            unit_indexes = self.rng.integers(len(self.business_units), size=count).tolist()
+            # 70% reconciled
+            reconciled_flags = (self.rng.random(count) > 0.3).tolist()
+            
+            yield from (
+                {
                     'BankAccountName': account_name,
-                    'Amount': self._generate_amount(currency),
-                    'TransactionDate': transaction_date.strftime('%m/%d/%Y'),
-                    'TransactionType': random.choice(self.transaction_types),
-                    'Reference': f"EXT-{account_name[:3]}-{i+1:02d}{chr(65 + i % 26)}",
-                    'BusinessUnit': random.choice(self.business_units),
-                    'Reconciled': 'Y' if random.random() > 0.3 else 'N'  # 70% reconciled
+                    'Amount': amounts[i],
+                    'TransactionDate': date_strings[days_offsets[i]],
+                    'TransactionType': self.transaction_types[type_indexes[i]],
+                    'Reference': reference_prefix + reference_suffixes[i],
+                    'BusinessUnit': self.business_units[unit_indexes[i]],
+                    'Reconciled': 'Y' if reconciled_flags[i] else 'N'
                 }
-                
-                transactions.append(transaction)
-        
-        return transactions
+                for i in range(count)
+            )
     
-    def _generate_amount(self, currency: str) -> float:
-        """Generate realistic transaction amounts"""
-        # Different amount ranges based on currency
-        if currency == 'USD':
-            base_range = (100, 10000)
-        elif currency == 'CAD':
-            base_range = (150, 15000)
-        elif currency == 'EUR':
-            base_range = (80, 8000)
-        else:  # GBP
-            base_range = (70, 7000)
-        
-        # 70% positive (credits), 30% negative (debits)
-        is_credit = random.random() > 0.3
-        amount = random.uniform(base_range[0], base_range[1])
-        
-        return round(amount, 2) if is_credit else round(-amount, 2)
+    def generate_dataframe(self, transactions: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build a DataFrame of the transactions column by column, without pandas inferring each record"""
+        columns = list(transactions[0]) if transactions else []
+        return pd.DataFrame({column: [transaction[column] for transaction in transactions] for column in columns})
     
     def generate_csv_content(self, transactions: List[Dict[str, Any]]) -> str:
         """Generate CSV content for external transactions"""
@@ -64,14 +84,28 @@ class ExternalCashGenerator:
             return ""
         
         # CSV header
-        csv_lines = ['BankAccountName,Amount,TransactionDate,TransactionType,Reference,BusinessUnit,Reconciled']
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow([
+            'BankAccountName', 'Amount', 'TransactionDate', 'TransactionType', 'Reference',
+            'BusinessUnit', 'Reconciled'
+        ])
         
         # CSV data rows
-        for transaction in transactions:
-            csv_line = f"{transaction['BankAccountName']},{transaction['Amount']},{transaction['TransactionDate']},{transaction['TransactionType']},{transaction['Reference']},{transaction['BusinessUnit']},{transaction['Reconciled']}"
-            csv_lines.append(csv_line)
+        writer.writerows(
+            (
+                transaction['BankAccountName'],
+                transaction['Amount'],
+                transaction['TransactionDate'],
+                transaction['TransactionType'],
+                transaction['Reference'],
+                transaction['BusinessUnit'],
+                transaction['Reconciled']
+            )
+            for transaction in transactions
+        )
         
-        return '\n'.join(csv_lines)
+        return buffer.getvalue()
     
     def generate_oracle_fusion_format(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate Oracle Fusion API format for posting"""
@@ -0,0 +1,49 @@
+import functools
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+@functools.lru_cache(maxsize=1)
+def company_name_pool(size: int) -> List[str]:
+    """Build the AP/AR company-name pool on first use, so importing a generator does not load Faker"""
+    from faker import Faker
+    fake = Faker()
+    fake.seed_instance(0)
+    return [fake.company() for _ in range(size)]
+
+def lines_dataframe(records: List[Dict[str, Any]], index_name: str) -> pd.DataFrame:
+    """Build one DataFrame of the lines of every invoice or journal, indexed by its record's position
+
+    Columns are filled straight from the line dicts, so pandas does not infer them
+    record by record; `df.loc[i:i]` gives the lines of record i.
+    """
+    lines = []
+    positions = []
+    for position, record in enumerate(records):
+        lines.extend(record['lines'])
+        positions.extend([position] * len(record['lines']))
+    
+    columns = list(lines[0]) if lines else []
+    return pd.DataFrame(
+        {column: [line[column] for line in lines] for column in columns},
+        index=pd.Index(positions, dtype='int64', name=index_name)
+    )
+
+class SeededGenerator:
+    """Base for the demo data generators that draw from a seedable numpy Generator"""
+    
+    def __init__(self, seed: Optional[int] = None):
+        self.seed(seed)
+    
+    @property
+    def rng(self) -> np.random.Generator:
+        """Random source, created on the first draw so formatting-only instances carry none"""
+        if self._rng is None:
+            self._rng = np.random.default_rng(self._seed)
+        return self._rng
+    
+    def seed(self, seed: Optional[int]):
+        """Seed the random source so the next generation is reproducible"""
+        self._seed = seed
+        self._rng = None
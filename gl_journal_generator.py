@@ -1,11 +1,16 @@
-import random
+import csv
+import io
 import datetime
-from typing import List, Dict, Any
-from faker import Faker
+from typing import Iterator, List, Dict, Any, Optional
 
-class GLJournalGenerator:
-    def __init__(self):
-        self.fake = Faker()
+import numpy as np
+import pandas as pd
+
+from generator_base import SeededGenerator, lines_dataframe
+
+class GLJournalGenerator(SeededGenerator):
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(seed)
         self.journal_types = ['STANDARD', 'ADJUSTMENT', 'RECLASSIFICATION', 'REVERSAL']
         self.business_units = ['US1 Business Unit', 'UK Business Unit', 'CA Business Unit']
         self.currencies = ['USD', 'CAD', 'EUR', 'GBP']
@@ -24,98 +29,142 @@ class GLJournalGenerator:
         self.journal_sources = ['MANUAL', 'AP', 'AR', 'CASH', 'INVENTORY', 'PAYROLL']
         self.journal_categories = ['GENERAL', 'ADJUSTMENT', 'RECLASSIFICATION', 'REVERSAL']
         self.period_names = ['JAN-2025', 'FEB-2025', 'MAR-2025', 'APR-2025', 'MAY-2025', 'JUN-2025']
-
+    
     def generate_gl_journals(self, accounts: List[Dict[str, Any]], 
                             journals_per_account: int = 2,
                             lines_per_journal: int = 3,
                             date_range_days: int = 30) -> List[Dict[str, Any]]:
         """Generate GL journal entries"""
-        journals = []
+        return list(self.iter_gl_journals(accounts, journals_per_account, lines_per_journal, date_range_days))
+    
+    def iter_gl_journals(self, accounts: List[Dict[str, Any]], 
+                         journals_per_account: int = 2,
+                         lines_per_journal: int = 3,
+                         date_range_days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Yield GL journal entries one at a time, so large runs need not be held in memory"""
+        base_date = datetime.datetime.now()
+        
+        # Journal dates fall within the last date_range_days, so format each day once
+        date_strings = {
+            days: (base_date - datetime.timedelta(days=days)).strftime('%Y/%m/%d')
+            for days in range(1, date_range_days + 1)
+        }
+        
+        # GL accounts as a (type, account) table padded with None, so a line's account can be
+        # looked up for a whole array of type and account indexes at once
+        account_type_names = np.array(self.account_types, dtype=object)
+        type_account_counts = np.array([len(self.gl_accounts[t]) for t in self.account_types])
+        account_table = np.full((len(self.account_types), type_account_counts.max()), None, dtype=object)
+        for type_index, account_type in enumerate(self.account_types):
+            account_table[type_index, :type_account_counts[type_index]] = self.gl_accounts[account_type]
         
         for account in accounts:
+            account_name = account['account_name']
+            currency = account['currency']
+            journal_prefix = account_name[:3].upper()
+            
+            # Amounts and sides of every non-balancing line of the account's journals,
+            # drawn in one call each and shaped (journal, line). Amounts stay in integer
+            # cents until here, so the journal totals and balancing line are exact
+            random_line_shape = (journals_per_account, max(lines_per_journal - 1, 0))
+            line_cents = self.rng.integers(100000, 1000000, size=random_line_shape, endpoint=True)
+            line_is_debit = self.rng.random(random_line_shape) < 0.5
+            debit_cents = np.where(line_is_debit, line_cents, 0)
+            credit_cents = np.where(line_is_debit, 0, line_cents)
+            debit_totals = debit_cents.sum(axis=1).tolist()
+            credit_totals = credit_cents.sum(axis=1).tolist()
+            debit_amounts = (debit_cents / 100).tolist()
+            credit_amounts = (credit_cents / 100).tolist()
+            line_types = np.where(line_is_debit, 'DEBIT', 'CREDIT').tolist()
+            
+            # Account type per line, then a GL account drawn from within that type
+            line_shape = (journals_per_account, lines_per_journal)
+            account_type_indexes = self.rng.integers(len(self.account_types), size=line_shape)
+            gl_account_indexes = self.rng.integers(type_account_counts[account_type_indexes])
+            line_account_types = account_type_names[account_type_indexes].tolist()
+            line_gl_accounts = account_table[account_type_indexes, gl_account_indexes].tolist()
+            
+            # Header fields, one value per journal
+            day_offsets = self.rng.integers(1, date_range_days, size=journals_per_account, endpoint=True).tolist()
+            type_indexes = self.rng.integers(len(self.journal_types), size=journals_per_account).tolist()
+            unit_indexes = self.rng.integers(len(self.business_units), size=journals_per_account).tolist()
+            ledger_indexes = self.rng.integers(len(self.ledgers), size=journals_per_account).tolist()
+            source_indexes = self.rng.integers(len(self.journal_sources), size=journals_per_account).tolist()
+            category_indexes = self.rng.integers(len(self.journal_categories), size=journals_per_account).tolist()
+            period_indexes = self.rng.integers(len(self.period_names), size=journals_per_account).tolist()
+            
             for journal_num in range(journals_per_account):
+                total_debit_cents = debit_totals[journal_num]
+                total_credit_cents = credit_totals[journal_num]
+                
+                # The last line balances the journal (debits = credits)
+                if total_debit_cents > total_credit_cents:
+                    balance = (total_debit_cents - total_credit_cents) / 100
+                    journal_debits = debit_amounts[journal_num] + [0.0]
+                    journal_credits = credit_amounts[journal_num] + [balance]
+                    journal_line_types = line_types[journal_num] + ['CREDIT']
+                else:
+                    balance = (total_credit_cents - total_debit_cents) / 100
+                    journal_debits = debit_amounts[journal_num] + [balance]
+                    journal_credits = credit_amounts[journal_num] + [0.0]
+                    journal_line_types = line_types[journal_num] + ['DEBIT']
+                journal_total = max(total_debit_cents, total_credit_cents) / 100
+                
                 # Generate journal header
-                journal_date = datetime.datetime.now() - datetime.timedelta(
-                    days=random.randint(1, date_range_days)
-                )
+                journal_date_string = date_strings[day_offsets[journal_num]]
+                business_unit = self.business_units[unit_indexes[journal_num]]
+                ledger = self.ledgers[ledger_indexes[journal_num]]
+                period_name = self.period_names[period_indexes[journal_num]]
                 
                 journal_header = {
-                    'JournalId': f"GL-{account['account_name'][:3].upper()}-{journal_num+1:03d}",
-                    'JournalName': f"Demo GL Journal {journal_num+1} for {account['account_name']}",
-                    'JournalDate': journal_date.strftime('%Y/%m/%d'),
-                    'JournalType': random.choice(self.journal_types),
-                    'BusinessUnit': random.choice(self.business_units),
-                    'Ledger': random.choice(self.ledgers),
-                    'Currency': account['currency'],
-                    'JournalSource': random.choice(self.journal_sources),
-                    'JournalCategory': random.choice(self.journal_categories),
-                    'PeriodName': random.choice(self.period_names),
+                    'JournalId': f"GL-{journal_prefix}-{journal_num+1:03d}",
+                    'JournalName': f"Demo GL Journal {journal_num+1} for {account_name}",
+                    'JournalDate': journal_date_string,
+                    'JournalType': self.journal_types[type_indexes[journal_num]],
+                    'BusinessUnit': business_unit,
+                    'Ledger': ledger,
+                    'Currency': currency,
+                    'JournalSource': self.journal_sources[source_indexes[journal_num]],
+                    'JournalCategory': self.journal_categories[category_indexes[journal_num]],
+                    'PeriodName': period_name,
                     'Status': 'DRAFT',
-                    'Description': f"Demo GL journal entry for {account['account_name']}",
-                    'TotalDebit': 0.0,
-                    'TotalCredit': 0.0
+                    'Description': f"Demo GL journal entry for {account_name}",
+                    'TotalDebit': journal_total,
+                    'TotalCredit': journal_total
                 }
                 
                 # Generate journal lines
                 journal_lines = []
-                total_debit = 0.0
-                total_credit = 0.0
-                
                 for line_num in range(lines_per_journal):
-                    # Ensure balanced journal (debits = credits)
-                    if line_num == lines_per_journal - 1:
-                        # Last line balances the journal
-                        if total_debit > total_credit:
-                            amount = total_debit - total_credit
-                            line_type = 'CREDIT'
-                            total_credit += amount
-                        else:
-                            amount = total_credit - total_debit
-                            line_type = 'DEBIT'
-                            total_debit += amount
-                    else:
-                        # Random line
-                        amount = round(random.uniform(1000, 10000), 2)
-                        line_type = random.choice(['DEBIT', 'CREDIT'])
-                        if line_type == 'DEBIT':
-                            total_debit += amount
-                        else:
-                            total_credit += amount
-                    
-                    # Select account type and GL account
-                    account_type = random.choice(self.account_types)
-                    gl_account = random.choice(self.gl_accounts[account_type])
-                    
                     journal_line = {
                         'LineNumber': line_num + 1,
-                        'AccountType': account_type,
-                        'GLAccount': gl_account,
+                        'AccountType': line_account_types[journal_num][line_num],
+                        'GLAccount': line_gl_accounts[journal_num][line_num],
                         'Description': f"Demo GL line {line_num + 1}",
-                        'DebitAmount': amount if line_type == 'DEBIT' else 0.0,
-                        'CreditAmount': amount if line_type == 'CREDIT' else 0.0,
-                        'LineType': line_type,
-                        'Currency': account['currency'],
-                        'BusinessUnit': journal_header['BusinessUnit'],
-                        'Ledger': journal_header['Ledger'],
-                        'PeriodName': journal_header['PeriodName'],
+                        'DebitAmount': journal_debits[line_num],
+                        'CreditAmount': journal_credits[line_num],
+                        'LineType': journal_line_types[line_num],
+                        'Currency': currency,
+                        'BusinessUnit': business_unit,
+                        'Ledger': ledger,
+                        'PeriodName': period_name,
                         'Status': 'DRAFT'
                     }
                     journal_lines.append(journal_line)
                 
-                # Update header totals
-                journal_header['TotalDebit'] = total_debit
-                journal_header['TotalCredit'] = total_credit
-                
-                journals.append({
+                yield {
                     'header': journal_header,
                     'lines': journal_lines
-                })
-        
-        return journals
+                }
 
+    def generate_lines_dataframe(self, journals: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build one DataFrame of every journal line; `df.loc[i:i]` gives the lines of journal i"""
+        return lines_dataframe(journals, index_name='journal')
+    
     def generate_csv_content(self, journals: List[Dict[str, Any]]) -> str:
         """Generate CSV content for GL journal import"""
-        csv_lines = []
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
         
         # Header
         header = [
@@ -125,7 +174,7 @@ class GLJournalGenerator:
             'LineNumber', 'AccountType', 'GLAccount', 'LineDescription', 
             'DebitAmount', 'CreditAmount', 'LineType', 'LineStatus'
         ]
-        csv_lines.append(','.join(header))
+        writer.writerow(header)
         
         # Data rows
         for journal in journals:
@@ -144,20 +193,20 @@ class GLJournalGenerator:
                     header['PeriodName'],
                     header['Status'],
                     header['Description'],
-                    str(header['TotalDebit']),
-                    str(header['TotalCredit']),
-                    str(line['LineNumber']),
+                    header['TotalDebit'],
+                    header['TotalCredit'],
+                    line['LineNumber'],
                     line['AccountType'],
                     line['GLAccount'],
                     line['Description'],
-                    str(line['DebitAmount']),
-                    str(line['CreditAmount']),
+                    line['DebitAmount'],
+                    line['CreditAmount'],
                     line['LineType'],
                     line['Status']
                 ]
-                csv_lines.append(','.join(row))
+                writer.writerow(row)
         
-        return '\n'.join(csv_lines)
+        return buffer.getvalue()
 
     def generate_oracle_fusion_format(self, journals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate Oracle Fusion API format for GL journals"""
@@ -1,19 +1,41 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import yaml
 import os
+import json
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import gzip
 import base64
 import xml.etree.ElementTree as ET
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 import re
+import time
+import datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared instances serve only the stateless formatting helpers (CSV, Fusion JSON,
+# DataFrames) and never draw, so they hold no random state (SeededGenerator creates
+# it on the first draw). Generation uses a fresh per-call generator, since sessions
+# run on separate threads and must not share a random number generator
+@st.cache_resource(show_spinner=False)
+def get_generator(generator_class):
+    return generator_class()
 
 # Import BAI2 generator
 try:
     from bai2_generator import BAI2Generator
-    bai2_gen = BAI2Generator()
+    bai2_gen = get_generator(BAI2Generator)
 except ImportError:
     st.error("❌ BAI2 generator not found - check if bai2_generator.py exists")
     bai2_gen = None
@@ -21,7 +43,7 @@ except ImportError:
 # Import External Cash generator
 try:
     from external_cash_generator import ExternalCashGenerator
-    external_cash_gen = ExternalCashGenerator()
+    external_cash_gen = get_generator(ExternalCashGenerator)
 except ImportError:
     st.error("❌ External cash generator not found")
     external_cash_gen = None
@@ -29,7 +51,7 @@ except ImportError:
 # Import AP Invoice generator
 try:
     from ap_invoice_generator import APInvoiceGenerator
-    ap_invoice_gen = APInvoiceGenerator()
+    ap_invoice_gen = get_generator(APInvoiceGenerator)
 except ImportError:
     st.error("❌ AP Invoice generator not found")
     ap_invoice_gen = None
@@ -37,7 +59,7 @@ except ImportError:
 # Import AR Invoice generator
 try:
     from ar_invoice_generator import ARInvoiceGenerator
-    ar_invoice_gen = ARInvoiceGenerator()
+    ar_invoice_gen = get_generator(ARInvoiceGenerator)
 except ImportError:
     st.error("❌ AR Invoice generator not found")
     ar_invoice_gen = None
@@ -45,7 +67,7 @@ except ImportError:
 # Import GL Journal generator
 try:
     from gl_journal_generator import GLJournalGenerator
-    gl_journal_gen = GLJournalGenerator()
+    gl_journal_gen = get_generator(GLJournalGenerator)
 except ImportError:
     st.error("❌ GL Journal generator not found")
     gl_journal_gen = None
@@ -67,6 +89,8 @@ if 'username' not in st.session_state:
     st.session_state.username = ""
 if 'password' not in st.session_state:
     st.session_state.password = ""
+if 'oauth_settings' not in st.session_state:
+    st.session_state.oauth_settings = None
 if 'base_url' not in st.session_state:
     st.session_state.base_url = "https://your-instance.fa.ocs.oraclecloud.com"
 if 'raw_api_response' not in st.session_state:
@@ -77,12 +101,16 @@ if 'external_transactions_per_account' not in st.session_state:
     st.session_state.external_transactions_per_account = 5
 if 'ap_invoices' not in st.session_state:
     st.session_state.ap_invoices = []
+if 'ap_lines_df' not in st.session_state:
+    st.session_state.ap_lines_df = pd.DataFrame()
 if 'ap_invoices_per_account' not in st.session_state:
     st.session_state.ap_invoices_per_account = 3
 if 'ap_lines_per_invoice' not in st.session_state:
     st.session_state.ap_lines_per_invoice = 2
 if 'ar_invoices' not in st.session_state:
     st.session_state.ar_invoices = []
+if 'ar_lines_df' not in st.session_state:
+    st.session_state.ar_lines_df = pd.DataFrame()
 if 'ar_receipts' not in st.session_state:
     st.session_state.ar_receipts = []
 if 'ar_invoices_per_account' not in st.session_state:
@@ -91,22 +119,41 @@ if 'ar_lines_per_invoice' not in st.session_state:
     st.session_state.ar_lines_per_invoice = 2
 if 'gl_journals' not in st.session_state:
     st.session_state.gl_journals = []
+if 'gl_lines_df' not in st.session_state:
+    st.session_state.gl_lines_df = pd.DataFrame()
 if 'gl_journals_per_account' not in st.session_state:
     st.session_state.gl_journals_per_account = 2
 if 'gl_lines_per_journal' not in st.session_state:
     st.session_state.gl_lines_per_journal = 3
 if 'bai2_content' not in st.session_state:
     st.session_state.bai2_content = None
+if 'prepared_downloads' not in st.session_state:
+    st.session_state.prepared_downloads = {}
+# Each session starts from its own random seed, so generated data differs between sessions
+if 'generation_seed' not in st.session_state:
+    st.session_state.generation_seed = int(np.random.default_rng().integers(2**31))
 
 st.title("🏦 Oracle Fusion Demo Transaction Generator")
 st.markdown("Generate demo transactions for Oracle Fusion Financials testing")
 
+# Prefer the libyaml C parser when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# The script re-executes on every rerun, so a module-level lru_cache would start empty
+# each time; st.cache_data keeps the parsed file and hands out a fresh copy per call,
+# which lets the caller override base_url without touching the cached dict.
+# The file's mtime is part of the key, so editing config.yaml takes effect on the next rerun
+@st.cache_data(show_spinner=False)
+def load_config_file(path, mtime):
+    """Parse a YAML config file once per modification"""
+    with open(path, 'r') as file:
+        return yaml.load(file, Loader=YAML_LOADER)
+
 # Load config
 try:
     config_path = Path("config/config.yaml")
     if config_path.exists():
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
+        config = load_config_file(str(config_path), config_path.stat().st_mtime)
     else:
         config = {
             'oracle_fusion': {
@@ -127,6 +174,17 @@ try:
                 st.session_state.username = st.secrets.oracle_fusion.username
             if not st.session_state.password and 'password' in st.secrets.oracle_fusion:
                 st.session_state.password = st.secrets.oracle_fusion.password
+            # Optional OAuth2 client credentials; when present they replace Basic auth for REST calls
+            if 'client_id' in st.secrets.oracle_fusion and 'client_secret' in st.secrets.oracle_fusion:
+                if 'token_url' not in st.secrets.oracle_fusion:
+                    st.error("❌ OAuth2 client credentials need a token_url in the oracle_fusion secrets - using Basic auth")
+                else:
+                    st.session_state.oauth_settings = {
+                        'token_url': st.secrets.oracle_fusion.token_url,
+                        'client_id': st.secrets.oracle_fusion.client_id,
+                        'client_secret': st.secrets.oracle_fusion.client_secret,
+                        'scope': st.secrets.oracle_fusion.get('scope')
+                    }
             if 'base_url' in st.secrets.oracle_fusion:
                 config['oracle_fusion']['base_url'] = st.secrets.oracle_fusion.base_url
                 st.session_state.base_url = st.secrets.oracle_fusion.base_url
@@ -145,8 +203,94 @@ except Exception as e:
         }
     }
 
+def _json_default(value):
+    """Encode the non-JSON types payloads can carry (numpy scalars/arrays, dates, decimals)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_json(data, indent=False):
+    """Serialize data to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(data, indent=2 if indent else None, default=_json_default).encode('utf-8')
+
+class PostSafeRetry(Retry):
+    """Retry policy that also retries POSTs, but only on throttling responses.
+
+    A 429 or 503 means Fusion rejected the request without processing it, so
+    resending cannot create duplicates. Other 5xx errors and read timeouts may
+    follow a partial write, so POSTs still surface those to the caller.
+    """
+    POST_RETRY_STATUSES = frozenset({429, 503})
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == 'POST':
+            return bool(self.total) and status_code in self.POST_RETRY_STATUSES
+        return super().is_retry(method, status_code, has_retry_after)
+
+def fusion_post(description):
+    """Report any unexpected error from a posting method in the UI and return False"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                st.error(f"❌ Failed to post {description}: {e}")
+                return False
+        return wrapper
+    return decorator
+
+class BearerTokenAuth(requests.auth.AuthBase):
+    """OAuth2 client-credentials auth for the REST session.
+
+    The token is fetched once and reused until shortly before it expires, so
+    requests carry a ready-made Bearer header instead of re-encoding Basic
+    credentials on every call.
+    """
+    # Seconds before expiry at which the token is refreshed
+    REFRESH_MARGIN = 30
+
+    def __init__(self, token_url, client_id, client_secret, scope=None, timeout=30):
+        self.settings = {'token_url': token_url, 'client_id': client_id, 'client_secret': client_secret, 'scope': scope}
+        self.timeout = timeout
+        self.access_token = None
+        self.token_expiry = 0.0
+
+    def _fetch_token(self):
+        data = {'grant_type': 'client_credentials'}
+        if self.settings['scope']:
+            data['scope'] = self.settings['scope']
+        response = requests.post(
+            self.settings['token_url'],
+            data=data,
+            auth=(self.settings['client_id'], self.settings['client_secret']),
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        token = response.json()
+        self.access_token = token['access_token']
+        self.token_expiry = time.monotonic() + float(token.get('expires_in', 3600))
+
+    def __call__(self, request):
+        if self.access_token is None or time.monotonic() >= self.token_expiry - self.REFRESH_MARGIN:
+            self._fetch_token()
+        request.headers['Authorization'] = f"Bearer {self.access_token}"
+        return request
+
 # Simple Oracle client (inline to avoid import issues)
 class SimpleOracleClient:
+    # Seconds a successful GET of reference data (bank accounts) is reused
+    GET_CACHE_TTL = 300
+    
     def __init__(self, config):
         self.config = config
         self.session = requests.Session()
@@ -154,23 +298,60 @@ class SimpleOracleClient:
         self.base_url = config['oracle_fusion']['base_url']
         self.api_version = config['oracle_fusion']['api_version']
         self.timeout = config['oracle_fusion']['timeout']
+        # Every REST call sends the same JSON headers; requests only pass headers that differ
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'X-Requested-With': 'XMLHttpRequest'
+        })
+        # Keep a pool of connections to the instance and retry transient failures.
+        # POSTs are only retried when Fusion refused them outright (see PostSafeRetry)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=PostSafeRetry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Endpoint that accepted the last post for each data type, so later
+        # posts go straight there instead of re-probing 404 fallbacks
+        self.working_endpoints = {}
+        # (url, params, auth) -> (fetched at, response) for _cached_get
+        self._get_cache = {}
+        # Age in seconds of the response the last _cached_get reused, None if fetched live
+        self.last_get_age = None
+    
+    def _cached_get(self, url, params=None, timeout=None, force_refresh=False):
+        """GET that reuses a successful response for GET_CACHE_TTL seconds"""
+        key = (url, tuple(sorted((params or {}).items())), self.session.auth)
+        now = time.monotonic()
+        cached = self._get_cache.get(key)
+        if cached and not force_refresh and now - cached[0] < self.GET_CACHE_TTL:
+            self.last_get_age = now - cached[0]
+            return cached[1]
+        
+        self.last_get_age = None
+        response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+        if response.status_code == 200:
+            self._get_cache[key] = (now, response)
+        return response
     
-    def get_bank_accounts_simple(self):
+    def get_bank_accounts_simple(self, force_refresh=False):
         """Simple bank accounts fetch without complex parameters"""
         try:
             # Use the correct API version from config
             api_url = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/cashBankAccounts"
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
             params = {
                 'limit': 10,
                 'onlyData': 'true'
             }
             
-            response = self.session.get(api_url, headers=headers, params=params, timeout=self.timeout)
+            response = self._cached_get(api_url, params=params, force_refresh=force_refresh)
             
             if response.status_code == 401:
                 st.error("❌ Authentication required. Please check your Oracle Fusion credentials.")
@@ -256,6 +437,21 @@ class SimpleOracleClient:
             st.warning(f"Error extracting account combination from account: {e}")
             return None
     
+    def _probe_endpoints(self, urls, timeout):
+        """GET independent URLs concurrently; returns each URL's response or exception, in order.
+
+        Only the HTTP calls run on worker threads, so callers report results with
+        st.* from the script thread in the original order.
+        """
+        def probe(url):
+            try:
+                return self.session.get(url, timeout=timeout)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+            return list(executor.map(probe, urls))
+    
     def search_cash_management_endpoints(self):
         """Search for Cash Management endpoints using different patterns"""
         try:
@@ -300,18 +496,16 @@ class SimpleOracleClient:
                 f"{self.base_url}/fscmRestApi/resources/{self.api_version}/generalLedger/balances"
             ]
             
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
             
             found_endpoints = []
             
-            for endpoint in api_patterns:
+            responses = self._probe_endpoints(api_patterns, timeout=5)
+            
+            for endpoint, response in zip(api_patterns, responses):
                 try:
                     st.info(f"🔍 Testing: {endpoint}")
-                    response = self.session.get(endpoint, headers=headers, timeout=5)
+                    if isinstance(response, Exception):
+                        raise response
                     
                     if response.status_code == 200:
                         st.success(f"✅ Found working endpoint: {endpoint}")
@@ -357,16 +551,11 @@ class SimpleOracleClient:
             # Use the official Oracle endpoint for ledger balances
             endpoint = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/ledgerBalances"
             
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
             
             st.info(f"🔍 Using official Oracle endpoint: {endpoint}")
             
             # First, try to get all ledger balances without filters
-            response = self.session.get(endpoint, headers=headers, timeout=10)
+            response = self.session.get(endpoint, timeout=10)
             
             if response.status_code == 200:
                 st.success(f"✅ Found working ledger balances endpoint: {endpoint}")
@@ -402,11 +591,6 @@ class SimpleOracleClient:
         try:
             endpoint = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/ledgerBalances"
             
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
             
             # Build query parameters for AccountBalanceFinder
             params = {
@@ -425,7 +609,7 @@ class SimpleOracleClient:
             if accounting_period:
                 params['accountingPeriod'] = accounting_period
             
-            response = self.session.get(endpoint, headers=headers, params=params, timeout=10)
+            response = self.session.get(endpoint, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -456,16 +640,11 @@ class SimpleOracleClient:
         try:
             endpoint = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/ledgerBalances"
             
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
             
             # Try simple GET request without complex parameters
             st.info(f"🔍 Trying simple ledger balances request: {endpoint}")
             
-            response = self.session.get(endpoint, headers=headers, timeout=10)
+            response = self.session.get(endpoint, timeout=10)
             
             st.info(f"🔍 Response status: {response.status_code}")
             
@@ -574,6 +753,7 @@ class SimpleOracleClient:
             
             headers = {
                 'Content-Type': 'text/xml; charset=utf-8',
+                'Accept': 'text/xml',
                 'SOAPAction': 'runReport'
             }
             
@@ -657,16 +837,11 @@ class SimpleOracleClient:
                 f"{self.base_url}/fscmRestApi/resources/{self.api_version}/bankAccounts"
             ]
             
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
             
             for endpoint in rest_endpoints:
                 try:
                     st.info(f"🔍 Trying REST endpoint: {endpoint}")
-                    response = self.session.get(endpoint, headers=headers, timeout=10)
+                    response = self.session.get(endpoint, timeout=10)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -722,13 +897,9 @@ class SimpleOracleClient:
         for version in versions_to_test:
             try:
                 api_url = f"{self.base_url}/fscmRestApi/resources/{version}/cashBankAccounts"
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                }
                 params = {'limit': 1}
                 
-                response = self.session.get(api_url, headers=headers, params=params, timeout=10)
+                response = self.session.get(api_url, params=params, timeout=10)
                 
                 if response.status_code == 200:
                     st.success(f"✅ Version {version} works!")
@@ -762,10 +933,13 @@ class SimpleOracleClient:
         
         available_endpoints = []
         
-        for endpoint in endpoints_to_test:
+        test_urls = [f"{self.base_url}/fscmRestApi/resources/{self.api_version}/{endpoint}" for endpoint in endpoints_to_test]
+        responses = self._probe_endpoints(test_urls, timeout=5)
+        
+        for endpoint, response in zip(endpoints_to_test, responses):
             try:
-                test_url = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/{endpoint}"
-                response = self.session.get(test_url, timeout=5)
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 200:
                     st.success(f"✅ {endpoint} - Available")
@@ -786,161 +960,145 @@ class SimpleOracleClient:
         return available_endpoints
 
     # ===== POSTING METHODS =====
+    def _post_to_first_available(self, possible_endpoints, fusion_data, data_type):
+        """POST one payload to the first endpoint that exists.
+
+        The payload is serialized once and reused for every attempt. Returns
+        the posting result, or None if every endpoint returned 404.
+        """
+        body = dumps_json(fusion_data)
+        
+        known = self.working_endpoints.get(data_type)
+        if known in possible_endpoints:
+            possible_endpoints = [known] + [url for url in possible_endpoints if url != known]
+        
+        # Try each endpoint until one works
+        for i, api_url in enumerate(possible_endpoints):
+            st.info(f"🔍 Trying endpoint {i+1}: {api_url}")
+            response = self.session.post(api_url, data=body, timeout=self.timeout)
+            
+            if response.status_code in [200, 201]:
+                st.success(f"✅ Found working endpoint: {api_url}")
+                self.working_endpoints[data_type] = api_url
+                return self._handle_posting_response(response, data_type)
+            elif response.status_code == 404:
+                st.warning(f"⚠️ Endpoint not found: {api_url}")
+                continue
+            else:
+                return self._handle_posting_response(response, data_type)
+        
+        return None
+    
+    def _post_batch(self, resource, items, data_type):
+        """Create many records of one resource in a single request via the REST batch endpoint"""
+        batch = {
+            "parts": [
+                {"id": f"part{i}", "path": f"/{resource}", "operation": "create", "payload": item}
+                for i, item in enumerate(items)
+            ]
+        }
+        response = self.session.post(
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}",
+            data=dumps_json(batch),
+            headers={'Content-Type': 'application/vnd.oracle.adf.batch+json'},
+            timeout=self.timeout
+        )
+        
+        if response.status_code == 200:
+            # The batch returns one part per record; a rejected record carries its error in the part payload
+            try:
+                parts = response.json().get('parts', [])
+            except ValueError:
+                parts = []
+            failed = [
+                part.get('id') for part in parts
+                if isinstance(part.get('payload'), dict)
+                and ('o:errorDetails' in part['payload'] or str(part['payload'].get('status', '')).startswith(('4', '5')))
+            ]
+            if failed:
+                st.error(f"❌ {len(failed)} of {len(items)} {data_type} were rejected: {', '.join(map(str, failed[:10]))}")
+                return False
+        
+        return self._handle_posting_response(response, data_type)
+    
+    @fusion_post("bank statement")
     def post_bank_statement(self, bai2_data):
         """Post BAI2 bank statement to Oracle Fusion"""
-        try:
-            # Try different possible endpoints for bank statements
-            possible_endpoints = [
-                f"{self.base_url}/fscmRestApi/resources/{self.api_version}/bankStatements",
-                f"{self.base_url}/fscmRestApi/resources/{self.api_version}/bankStatementImport",
-                f"{self.base_url}/fscmRestApi/resources/{self.api_version}/cashBankStatements"
-            ]
-            
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-            
-            # Convert BAI2 data to Oracle Fusion format
-            fusion_data = self._convert_bai2_to_fusion_format(bai2_data)
-            
-            st.info(f"📤 Posting bank statement")
-            
-            # Try each endpoint until one works
-            for i, api_url in enumerate(possible_endpoints):
-                st.info(f"🔍 Trying endpoint {i+1}: {api_url}")
-                response = self.session.post(api_url, headers=headers, json=fusion_data, timeout=self.timeout)
-                
-                if response.status_code in [200, 201]:
-                    st.success(f"✅ Found working endpoint: {api_url}")
-                    return self._handle_posting_response(response, "Bank Statement")
-                elif response.status_code == 404:
-                    st.warning(f"⚠️ Endpoint not found: {api_url}")
-                    continue
-                else:
-                    return self._handle_posting_response(response, "Bank Statement")
-            
-            # If all endpoints fail
-            st.error("❌ All bank statement endpoints returned 404. Bank statement posting may not be available in this Oracle Fusion instance.")
-            return False
-            
-        except Exception as e:
-            st.error(f"❌ Failed to post bank statement: {e}")
-            return False
+        # Try different possible endpoints for bank statements
+        possible_endpoints = [
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}/bankStatements",
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}/bankStatementImport",
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}/cashBankStatements"
+        ]
+        
+        
+        # Convert BAI2 data to Oracle Fusion format
+        fusion_data = self._convert_bai2_to_fusion_format(bai2_data)
+        
+        st.info(f"📤 Posting bank statement")
+        
+        result = self._post_to_first_available(possible_endpoints, fusion_data, "Bank Statement")
+        if result is not None:
+            return result
+        
+        # If all endpoints fail
+        st.error("❌ All bank statement endpoints returned 404. Bank statement posting may not be available in this Oracle Fusion instance.")
+        return False
     
+    @fusion_post("external cash transactions")
     def post_external_cash_transactions(self, transactions):
         """Post external cash transactions to Oracle Fusion"""
-        try:
-            api_url = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/externalCashTransactions"
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-            
-            # Convert to Oracle Fusion format
-            fusion_data = self._convert_external_cash_to_fusion_format(transactions)
-            
-            st.info(f"📤 Posting {len(transactions)} external cash transactions")
-            response = self.session.post(api_url, headers=headers, json=fusion_data, timeout=self.timeout)
-            
-            return self._handle_posting_response(response, "External Cash Transactions")
-            
-        except Exception as e:
-            st.error(f"❌ Failed to post external cash transactions: {e}")
-            return False
+        # Convert to Oracle Fusion format
+        fusion_data = self._convert_external_cash_to_fusion_format(transactions)
+        
+        st.info(f"📤 Posting {len(transactions)} external cash transactions")
+        return self._post_batch("externalCashTransactions", fusion_data["transactions"], "External Cash Transactions")
     
+    @fusion_post("AP invoices")
     def post_ap_invoices(self, invoices):
         """Post AP invoices to Oracle Fusion"""
-        try:
-            api_url = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/apInvoices"
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-            
-            # Convert to Oracle Fusion format
-            fusion_data = self._convert_ap_invoices_to_fusion_format(invoices)
-            
-            st.info(f"📤 Posting {len(invoices)} AP invoices")
-            response = self.session.post(api_url, headers=headers, json=fusion_data, timeout=self.timeout)
-            
-            return self._handle_posting_response(response, "AP Invoices")
-            
-        except Exception as e:
-            st.error(f"❌ Failed to post AP invoices: {e}")
-            return False
+        # Convert to Oracle Fusion format
+        fusion_data = self._convert_ap_invoices_to_fusion_format(invoices)
+        
+        st.info(f"📤 Posting {len(invoices)} AP invoices")
+        return self._post_batch("apInvoices", fusion_data["invoices"], "AP Invoices")
     
+    @fusion_post("AR invoices")
     def post_ar_invoices(self, invoices):
         """Post AR invoices to Oracle Fusion"""
-        try:
-            api_url = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/arInvoices"
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-            
-            # Convert to Oracle Fusion format
-            fusion_data = self._convert_ar_invoices_to_fusion_format(invoices)
-            
-            st.info(f"📤 Posting {len(invoices)} AR invoices")
-            response = self.session.post(api_url, headers=headers, json=fusion_data, timeout=self.timeout)
-            
-            return self._handle_posting_response(response, "AR Invoices")
-            
-        except Exception as e:
-            st.error(f"❌ Failed to post AR invoices: {e}")
-            return False
+        # Convert to Oracle Fusion format
+        fusion_data = self._convert_ar_invoices_to_fusion_format(invoices)
+        
+        st.info(f"📤 Posting {len(invoices)} AR invoices")
+        return self._post_batch("arInvoices", fusion_data["invoices"], "AR Invoices")
     
+    @fusion_post("GL journals")
     def post_gl_journals(self, journals):
         """Post GL journals to Oracle Fusion"""
-        try:
-            # Try different possible endpoints for GL journals
-            possible_endpoints = [
-                f"{self.base_url}/fscmRestApi/resources/{self.api_version}/glJournals",
-                f"{self.base_url}/fscmRestApi/resources/{self.api_version}/generalLedgerJournals",
-                f"{self.base_url}/fscmRestApi/resources/{self.api_version}/journals",
-                f"{self.base_url}/fscmRestApi/resources/{self.api_version}/glJournalEntries"
-            ]
-            
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-            
-            # Convert to Oracle Fusion format
-            fusion_data = self._convert_gl_journals_to_fusion_format(journals)
-            
-            st.info(f"📤 Posting {len(journals)} GL journals")
-            
-            # Try each endpoint until one works
-            for i, api_url in enumerate(possible_endpoints):
-                st.info(f"🔍 Trying endpoint {i+1}: {api_url}")
-                response = self.session.post(api_url, headers=headers, json=fusion_data, timeout=self.timeout)
-                
-                if response.status_code in [200, 201]:
-                    st.success(f"✅ Found working endpoint: {api_url}")
-                    return self._handle_posting_response(response, "GL Journals")
-                elif response.status_code == 404:
-                    st.warning(f"⚠️ Endpoint not found: {api_url}")
-                    continue
-                else:
-                    return self._handle_posting_response(response, "GL Journals")
-            
-            # If all endpoints fail
-            st.error("❌ All GL journal endpoints returned 404. GL journal posting may not be available in this Oracle Fusion instance.")
-            st.info("💡 **Available endpoints in your instance:**")
-            st.info("• Bank Accounts: /cashBankAccounts ✅")
-            st.info("• Other endpoints may need to be discovered")
-            return False
-            
-        except Exception as e:
-            st.error(f"❌ Failed to post GL journals: {e}")
-            return False
+        # Try different possible endpoints for GL journals
+        possible_endpoints = [
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}/glJournals",
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}/generalLedgerJournals",
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}/journals",
+            f"{self.base_url}/fscmRestApi/resources/{self.api_version}/glJournalEntries"
+        ]
+        
+        
+        # Convert to Oracle Fusion format
+        fusion_data = self._convert_gl_journals_to_fusion_format(journals)
+        
+        st.info(f"📤 Posting {len(journals)} GL journals")
+        
+        result = self._post_to_first_available(possible_endpoints, fusion_data, "GL Journals")
+        if result is not None:
+            return result
+        
+        # If all endpoints fail
+        st.error("❌ All GL journal endpoints returned 404. GL journal posting may not be available in this Oracle Fusion instance.")
+        st.info("💡 **Available endpoints in your instance:**")
+        st.info("• Bank Accounts: /cashBankAccounts ✅")
+        st.info("• Other endpoints may need to be discovered")
+        return False
     
     def _handle_posting_response(self, response, data_type):
         """Handle posting response and show appropriate messages"""
@@ -1143,24 +1301,19 @@ class SimpleOracleClient:
             "source": "Demo Transaction Generator"
         }
 
-    def get_simple_opening_balances(self):
+    def get_simple_opening_balances(self, force_refresh=False):
         """Get opening balances using the bank accounts endpoint that we know works"""
         try:
             st.info("🔍 Getting opening balances from bank accounts data...")
             
             # Use the bank accounts endpoint that we know works
             api_url = f"{self.base_url}/fscmRestApi/resources/{self.api_version}/cashBankAccounts"
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest'
-            }
             params = {
                 'limit': 50,  # Get more accounts
                 'onlyData': 'true'
             }
             
-            response = self.session.get(api_url, headers=headers, params=params, timeout=10)
+            response = self._cached_get(api_url, params=params, timeout=10, force_refresh=force_refresh)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1244,6 +1397,173 @@ class SimpleOracleClient:
             st.error(f"Failed to get opening balances: {e}")
             return None
 
+def show_cache_notice(client):
+    """Tell the user when the last bank accounts response was reused rather than fetched"""
+    if client.last_get_age is not None:
+        st.caption(f"ℹ️ Bank accounts reused from a response fetched {client.last_get_age:.0f}s ago")
+
+def get_oracle_client():
+    """Return this session's Oracle client, keeping its HTTP connections alive between requests"""
+    client_key = (
+        config['oracle_fusion']['base_url'],
+        config['oracle_fusion']['api_version'],
+        config['oracle_fusion']['timeout']
+    )
+    # Rebuild only when the instance settings change; the requests.Session inside the
+    # client keeps its pooled TCP/TLS connections for every later fetch and post
+    if st.session_state.get('oracle_client_key') != client_key:
+        st.session_state.oracle_client = SimpleOracleClient(config)
+        st.session_state.oracle_client_key = client_key
+    
+    client = st.session_state.oracle_client
+    # Credentials can change in the sidebar at any time, so apply them on every call.
+    # An OAuth2 token is kept on the session and only replaced when its settings change
+    oauth_settings = st.session_state.oauth_settings
+    if oauth_settings:
+        if getattr(client.session.auth, 'settings', None) != oauth_settings:
+            client.session.auth = BearerTokenAuth(timeout=client.timeout, **oauth_settings)
+    elif st.session_state.username and st.session_state.password:
+        client.session.auth = (st.session_state.username, st.session_state.password)
+    else:
+        client.session.auth = None
+    return client
+
+# Detail sections render at most this many invoices/journals per rerun
+DETAIL_PAGE_SIZE = 25
+
+# The BAI2 preview shows at most this many records; the downloads carry the whole file
+BAI2_PREVIEW_LINES = 200
+
+# Read-only fallback accounts used when the bank account fetch fails
+DEMO_ACCOUNTS = (
+    {
+        'account_id': '300000004068939',
+        'account_name': 'Main Operating Account',
+        'account_number': '1234567890',
+        'bank_name': 'Test Bank',
+        'currency': 'USD',
+        'account_number_for_transactions': '1234567890',
+        'opening_balance': 50000.0,
+        'closing_balance': 50000.0
+    },
+    {
+        'account_id': '300000004068940',
+        'account_name': 'Secondary Account',
+        'account_number': '0987654321',
+        'bank_name': 'Test Bank 2',
+        'currency': 'USD',
+        'account_number_for_transactions': '0987654321',
+        'opening_balance': 25000.0,
+        'closing_balance': 25000.0
+    }
+)
+
+def paginate(items, key, page_size=DETAIL_PAGE_SIZE):
+    """Show a page selector and return (start index, items on the selected page)"""
+    page_count = max(1, (len(items) + page_size - 1) // page_size)
+    if page_count == 1:
+        return 0, items
+    
+    # The page lives only in Session State; reset a stale page number left over
+    # from a larger previous generation
+    if st.session_state.setdefault(key, 1) > page_count:
+        st.session_state[key] = 1
+    page = st.number_input(
+        f"Page (1-{page_count})",
+        min_value=1,
+        max_value=page_count,
+        help=f"Showing {page_size} records per page",
+        key=key
+    )
+    start = (page - 1) * page_size
+    return start, items[start:start + page_size]
+
+def prepared_download(label, build_data, file_name, mime, key):
+    """Build a download file only once its prepare button is clicked, then offer it"""
+    prepared = st.session_state.prepared_downloads
+    if st.button(f"⚙️ Prepare {label}", key=f"prepare_{key}_btn", use_container_width=True):
+        prepared[key] = build_data()
+    if key in prepared:
+        st.download_button(
+            label=f"📥 {label}",
+            data=prepared[key],
+            file_name=file_name,
+            mime=mime,
+            use_container_width=True,
+            key=f"download_{key}_btn"
+        )
+
+def clear_prepared_downloads(prefix):
+    """Drop prepared download files of a section whose data has changed"""
+    prepared = st.session_state.prepared_downloads
+    for key in [key for key in prepared if key.startswith(prefix)]:
+        del prepared[key]
+
+# Generation is memoized on its parameters plus a seed, so clicking Generate again
+# with unchanged settings returns the same data without re-running the generator.
+# Each call seeds its own generator, so the result depends only on the cache key.
+# The generators date records from today, so generation_date is only read as part
+# of the key: a cached result never outlives the day it was generated on
+@st.cache_data(show_spinner=False)
+def generate_ap_invoices_cached(accounts, invoices_per_account, lines_per_invoice, date_range_days, seed, generation_date):
+    return APInvoiceGenerator(seed).generate_ap_invoices(
+        accounts=accounts,
+        invoices_per_account=invoices_per_account,
+        lines_per_invoice=lines_per_invoice,
+        date_range_days=date_range_days
+    )
+
+@st.cache_data(show_spinner=False)
+def generate_ar_data_cached(accounts, invoices_per_account, lines_per_invoice, date_range_days, receipt_percentage, seed, generation_date):
+    ar_invoice_generator = ARInvoiceGenerator(seed)
+    ar_invoices = ar_invoice_generator.generate_ar_invoices(
+        accounts=accounts,
+        invoices_per_account=invoices_per_account,
+        lines_per_invoice=lines_per_invoice,
+        date_range_days=date_range_days
+    )
+    ar_receipts = ar_invoice_generator.generate_receipts(
+        invoices=ar_invoices,
+        receipt_percentage=receipt_percentage
+    )
+    return ar_invoices, ar_receipts
+
+@st.cache_data(show_spinner=False)
+def generate_gl_journals_cached(accounts, journals_per_account, lines_per_journal, date_range_days, seed, generation_date):
+    return GLJournalGenerator(seed).generate_gl_journals(
+        accounts=accounts,
+        journals_per_account=journals_per_account,
+        lines_per_journal=lines_per_journal,
+        date_range_days=date_range_days
+    )
+
+# Amounts stay numeric in summary tables and are formatted by the frontend
+MONEY_COLUMN = st.column_config.NumberColumn(format="$%.2f")
+INVOICE_LINE_COLUMNS = {'Amount': MONEY_COLUMN, 'UnitPrice': MONEY_COLUMN}
+JOURNAL_LINE_COLUMNS = {'DebitAmount': MONEY_COLUMN, 'CreditAmount': MONEY_COLUMN}
+
+# Per-invoice fields reduced for the summary metrics, gathered in a single np.fromiter pass
+INVOICE_TOTALS_DTYPE = np.dtype([('amount', 'f8'), ('lines', 'i8')])
+JOURNAL_TOTALS_DTYPE = np.dtype([('debit', 'f8'), ('credit', 'f8'), ('lines', 'i8')])
+
+def truncated(values, width):
+    """Shorten long strings for the compact summary tables"""
+    return [value[:width] + "..." if len(value) > width else value for value in values]
+
+def show_table(columns, money_columns=()):
+    """Render a {column: values} mapping as an Arrow-backed table with client-side amount formatting.
+
+    Tables are built column-wise, so no per-row dict is allocated and pandas
+    skips inferring columns from a list of records.
+    """
+    table_df = pd.DataFrame(columns).convert_dtypes(dtype_backend="pyarrow")
+    st.dataframe(
+        table_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={column: MONEY_COLUMN for column in money_columns}
+    )
+
 # Sidebar
 with st.sidebar:
     st.header("🔧 Configuration")
@@ -1275,14 +1595,18 @@ with st.sidebar:
     
     # Oracle connection test - SIMPLIFIED
     st.subheader("Oracle Connection")
+    reuse_cached_accounts = st.checkbox(
+        "Reuse bank accounts fetched in the last 5 minutes",
+        value=False,
+        help="Skip the Oracle round trip when the same bank accounts were fetched recently",
+        key="reuse_cached_accounts"
+    )
     if st.button("Test Oracle Connection", key="test_connection_btn"):
         try:
-            client = SimpleOracleClient(config)
-            # Add authentication if provided
-            if username and password:
-                client.session.auth = (username, password)
+            client = get_oracle_client()
             
-            result = client.get_bank_accounts_simple()
+            # A connection test must always reach Oracle
+            result = client.get_bank_accounts_simple(force_refresh=True)
             if result and 'items' in result and len(result['items']) > 0:
                 st.success("✅ Connected successfully!")
             else:
@@ -1299,13 +1623,11 @@ with st.sidebar:
     with col1:
         if st.button("🔍 Test Simple Bank Accounts", key="test_simple_btn"):
             try:
-                client = SimpleOracleClient(config)
-                # Add authentication if provided
-                if username and password:
-                    client.session.auth = (username, password)
+                client = get_oracle_client()
                 
                 # Try the simple bank accounts approach (we know it works)
-                simple_result = client.get_simple_opening_balances()
+                simple_result = client.get_simple_opening_balances(force_refresh=not reuse_cached_accounts)
+                show_cache_notice(client)
                 
                 if simple_result and 'data' in simple_result:
                     st.success("✅ Simple bank accounts working!")
@@ -1327,10 +1649,7 @@ with st.sidebar:
     with col2:
         if st.button("🔍 Test BIP Publisher", key="test_bip_btn"):
             try:
-                client = SimpleOracleClient(config)
-                # Add authentication if provided
-                if username and password:
-                    client.session.auth = (username, password)
+                client = get_oracle_client()
                 
                 # Try the BIP Publisher approach with working SQL
                 bip_result = client.get_real_opening_balances_bip()
@@ -1407,14 +1726,10 @@ with tab1:
     # Fetch button
     if st.button("Fetch Real Bank Accounts", type="primary", key="fetch_accounts_btn"):
         try:
-            client = SimpleOracleClient(config)
+            client = get_oracle_client()
             
-            # Add authentication if provided in sidebar
-            if 'username' in st.session_state and 'password' in st.session_state:
-                if st.session_state.username and st.session_state.password:
-                    client.session.auth = (st.session_state.username, st.session_state.password)
-            
-            result = client.get_bank_accounts_simple()
+            result = client.get_bank_accounts_simple(force_refresh=not reuse_cached_accounts)
+            show_cache_notice(client)
             bip_opening_balances = client.get_real_opening_balances_bip()
             
             if result and 'items' in result:
@@ -1541,29 +1856,8 @@ with tab1:
                 
         except Exception as e:
             st.error(f"❌ Error fetching accounts: {e}")
-            # Fallback to fake data
-            fake_accounts = [
-                {
-                    'account_id': '300000004068939',
-                    'account_name': 'Main Operating Account',
-                    'account_number': '1234567890',
-                    'bank_name': 'Test Bank',
-                    'currency': 'USD',
-                    'account_number_for_transactions': '1234567890',
-                    'opening_balance': 50000.0,
-                    'closing_balance': 50000.0
-                },
-                {
-                    'account_id': '300000004068940',
-                    'account_name': 'Secondary Account',
-                    'account_number': '0987654321',
-                    'bank_name': 'Test Bank 2',
-                    'currency': 'USD',
-                    'account_number_for_transactions': '0987654321',
-                    'opening_balance': 25000.0,
-                    'closing_balance': 25000.0
-                }
-            ]
+            # Fallback to fake data; session state gets its own copies of the shared constants
+            fake_accounts = [dict(account) for account in DEMO_ACCOUNTS]
             st.session_state.real_accounts = fake_accounts
             st.session_state.transactions_per_account = transactions_per_account
             st.success(f"✅ Using {len(fake_accounts)} demo accounts!")
@@ -1572,25 +1866,24 @@ with tab1:
     if st.session_state.real_accounts:
         st.subheader("💰 Real Opening Balances")
         
-        # Simple table showing real balances per account
-        balance_data = []
-        for account in st.session_state.real_accounts:
-            balance_data.append({
-                'Account Name': account['account_name'],
-                'Account Number': account['account_number'],
-                'Bank': account['bank_name'],
-                'Currency': account['currency'],
-                'Opening Balance': f"{account['opening_balance']:,.2f}",
-                'Balance Date': '2025-01-15'  # Default date
-            })
-        
-        balance_df = pd.DataFrame(balance_data)
+        # Simple table showing real balances per account, built straight from the account dicts
+        balance_df = pd.DataFrame(
+            st.session_state.real_accounts,
+            columns=['account_name', 'account_number', 'bank_name', 'currency', 'opening_balance']
+        ).rename(columns={
+            'account_name': 'Account Name',
+            'account_number': 'Account Number',
+            'bank_name': 'Bank',
+            'currency': 'Currency',
+            'opening_balance': 'Opening Balance'
+        })
+        balance_df['Opening Balance'] = balance_df['Opening Balance'].map('{:,.2f}'.format)
+        balance_df['Balance Date'] = '2025-01-15'  # Default date
         st.dataframe(balance_df, use_container_width=True)
         
         # Download complete raw API response (simplified - no preview)
         if 'raw_api_response' in st.session_state:
-            import json
-            raw_json_data = json.dumps(st.session_state.raw_api_response, indent=2)
+            raw_json_data = dumps_json(st.session_state.raw_api_response, indent=True)
             st.download_button(
                 label="📥 Download Complete Raw JSON",
                 data=raw_json_data,
@@ -1602,9 +1895,26 @@ with tab1:
         if st.button("Generate Demo Transactions", type="primary", key="generate_transactions_btn"):
             st.info("🔄 Generating realistic transactions with mixed credits/debits...")
             
+            # Create realistic transaction descriptions
+            transaction_types = [
+                "Bank Transfer", "ATM Withdrawal", "Direct Deposit", "Check Payment",
+                "Wire Transfer", "Online Payment", "Service Fee", "Interest Payment",
+                "Loan Payment", "Investment Deposit", "Utility Payment", "Insurance Premium",
+                "Tax Payment", "Salary Deposit", "Vendor Payment", "Customer Payment"
+            ]
+            transactions_per_account = st.session_state.transactions_per_account
+            
+            # Ids, dates and descriptions depend only on the position in the statement,
+            # so format them once and share them across accounts
+            transaction_ids = [f"TXN{i:03d}" for i in range(1, transactions_per_account + 1)]
+            transaction_dates = [f"2024-01-{i:02d}" for i in range(1, transactions_per_account + 1)]
+            transaction_descriptions = [transaction_types[i % len(transaction_types)] for i in range(transactions_per_account)]
+            
             # Generate transactions that respect the balance logic
             all_transactions = []
             for account in st.session_state.real_accounts:
+                account_id = account['account_id']
+                account_name = account['account_name']
                 opening_bal = account['opening_balance']
                 # Use target balance from input, or default to opening balance if not set
                 target_balance = target_balances.get(account['account_id'], opening_bal)
@@ -1613,18 +1923,20 @@ with tab1:
                 # Calculate transactions to achieve the required change
                 transactions = []
                 remaining_change = required_change
+                # Running balance carried forward one transaction at a time
+                current_balance = opening_bal
+                
+                # Generate realistic transaction amounts
+                # Base amount based on account balance scale
+                balance_scale = abs(opening_bal) / 1000  # Scale based on account size
+                base_amount = max(100, min(5000, balance_scale * 100))  # Realistic amounts
                 
                 # Generate realistic transaction amounts and types
-                for i in range(st.session_state.transactions_per_account):
-                    if i == st.session_state.transactions_per_account - 1:
+                for i in range(transactions_per_account):
+                    if i == transactions_per_account - 1:
                         # Last transaction - use remaining amount to balance exactly
                         amount = remaining_change
                     else:
-                        # Generate realistic transaction amounts
-                        # Base amount based on account balance scale
-                        balance_scale = abs(opening_bal) / 1000  # Scale based on account size
-                        base_amount = max(100, min(5000, balance_scale * 100))  # Realistic amounts
-                        
                         # Create mixed transaction types (not just mathematical)
                         # 60% chance of credit, 40% chance of debit for variety
                         if i % 3 == 0:  # Every 3rd transaction
@@ -1651,34 +1963,15 @@ with tab1:
                         # Round to 2 decimal places
                         amount = round(amount, 2)
                     
-                    # Calculate running balance
-                    current_balance = opening_bal
-                    for prev_txn in transactions:
-                        if prev_txn['type'] == 'Credit':
-                            current_balance += prev_txn['amount']
-                        else:
-                            current_balance -= prev_txn['amount']
-                    
-                    # Add current transaction to running balance
-                    if amount > 0:
-                        current_balance += amount
-                    else:
-                        current_balance -= abs(amount)
-                    
-                    # Create realistic transaction descriptions
-                    transaction_types = [
-                        "Bank Transfer", "ATM Withdrawal", "Direct Deposit", "Check Payment",
-                        "Wire Transfer", "Online Payment", "Service Fee", "Interest Payment",
-                        "Loan Payment", "Investment Deposit", "Utility Payment", "Insurance Premium",
-                        "Tax Payment", "Salary Deposit", "Vendor Payment", "Customer Payment"
-                    ]
+                    # Add current transaction to running balance (debits carry a negative amount)
+                    current_balance += amount
                     
                     transaction = {
-                        'account_id': account['account_id'],
-                        'account_name': account['account_name'],
-                        'transaction_id': f"TXN{i+1:03d}",
-                        'date': f"2024-01-{(i+1):02d}",
-                        'description': transaction_types[i % len(transaction_types)],
+                        'account_id': account_id,
+                        'account_name': account_name,
+                        'transaction_id': transaction_ids[i],
+                        'date': transaction_dates[i],
+                        'description': transaction_descriptions[i],
                         'amount': abs(amount),
                         'type': 'Credit' if amount > 0 else 'Debit',
                         'running_balance': current_balance
@@ -1698,10 +1991,17 @@ with tab1:
             
             # Show balance verification
             st.subheader("💰 Balance Verification")
+            # Credit and debit totals for every account in a single pass over the transactions
+            account_totals = {}
+            for t in all_transactions:
+                totals = account_totals.setdefault(t['account_id'], [0.0, 0.0])
+                if t['type'] == 'Credit':
+                    totals[0] += t['amount']
+                elif t['type'] == 'Debit':
+                    totals[1] += t['amount']
+            
             for account in st.session_state.real_accounts:
-                account_transactions = [t for t in all_transactions if t['account_id'] == account['account_id']]
-                total_credits = sum(t['amount'] for t in account_transactions if t['type'] == 'Credit')
-                total_debits = sum(t['amount'] for t in account_transactions if t['type'] == 'Debit')
+                total_credits, total_debits = account_totals.get(account['account_id'], (0.0, 0.0))
                 net_change = total_credits - total_debits
                 final_balance = account['opening_balance'] + net_change
                 target_balance = target_balances.get(account['account_id'], account['opening_balance'])
@@ -1747,7 +2047,7 @@ with tab1:
                     st.info("📊 Using realistic transactions from previous generation...")
                     try:
                         # Try with pre_generated_transactions parameter (newer version)
-                        bai2_content = bai2_gen.generate_bai2_file(
+                        bai2_content = BAI2Generator().generate_bai2_file(
                             accounts=st.session_state.real_accounts,
                             transactions_per_account=st.session_state.transactions_per_account,
                             pre_generated_transactions=st.session_state.generated_transactions
@@ -1756,7 +2056,7 @@ with tab1:
                     except TypeError:
                         # Fallback for older version without pre_generated_transactions parameter
                         st.warning("⚠️ Using older BAI2 generator version - generating transactions within BAI2")
-                        bai2_content = bai2_gen.generate_bai2_file(
+                        bai2_content = BAI2Generator().generate_bai2_file(
                             accounts=st.session_state.real_accounts,
                             transactions_per_account=st.session_state.transactions_per_account
                         )
@@ -1764,7 +2064,7 @@ with tab1:
                 else:
                     # Fallback to generating transactions within BAI2 generator
                     st.info("📊 Using fallback transaction generation...")
-                    bai2_content = bai2_gen.generate_bai2_file(
+                    bai2_content = BAI2Generator().generate_bai2_file(
                         accounts=st.session_state.real_accounts,
                         transactions_per_account=st.session_state.transactions_per_account
                     )
@@ -1772,11 +2072,17 @@ with tab1:
                 
                 # Store BAI2 content in session state
                 st.session_state.bai2_content = bai2_content
+                clear_prepared_downloads("bai2_")
                 
                 # Display BAI2 preview
                 st.subheader("🏦 BAI2 Bank Statement")
                 with st.expander("📋 BAI2 Content Preview"):
-                    st.code(bai2_content, language="text")
+                    # Split off only the head instead of every record of a large file
+                    preview_lines = bai2_content.split('\n', BAI2_PREVIEW_LINES)
+                    st.code('\n'.join(preview_lines[:BAI2_PREVIEW_LINES]), language="text")
+                    if len(preview_lines) > BAI2_PREVIEW_LINES:
+                        record_count = bai2_content.count('\n') + 1
+                        st.caption(f"Showing the first {BAI2_PREVIEW_LINES:,} of {record_count:,} records; download the file for the rest")
                 
                 # Download BAI2 file
                 st.download_button(
@@ -1799,6 +2105,16 @@ with tab1:
         
         # Post to Oracle Fusion button (only show if BAI2 was generated)
         if 'bai2_content' in st.session_state and st.session_state.bai2_content:
+            # The gzip copy is compressed only when asked for, like the other sections' downloads
+            st.markdown("---")
+            prepared_download(
+                "BAI2 File (gzip)",
+                lambda: gzip.compress(st.session_state.bai2_content.encode('utf-8'), compresslevel=1),
+                file_name="bank_statement.bai2.gz",
+                mime="application/gzip",
+                key="bai2_gzip"
+            )
+            
             st.markdown("---")
             st.subheader("📤 Post to Oracle Fusion")
             
@@ -1808,12 +2124,7 @@ with tab1:
                     st.info("📤 Posting BAI2 bank statement to Oracle Fusion...")
                     
                     try:
-                        client = SimpleOracleClient(config)
-                        
-                        # Add authentication if provided in sidebar
-                        if 'username' in st.session_state and 'password' in st.session_state:
-                            if st.session_state.username and st.session_state.password:
-                                client.session.auth = (st.session_state.username, st.session_state.password)
+                        client = get_oracle_client()
                         
                         # Post to Oracle Fusion
                         success = client.post_bank_statement(st.session_state.bai2_content)
@@ -1830,6 +2141,7 @@ with tab1:
                 if st.button("🔄 Clear BAI2 Data", type="secondary", key="clear_bai2_btn"):
                     if 'bai2_content' in st.session_state:
                         del st.session_state.bai2_content
+                    clear_prepared_downloads("bai2_")
                     st.rerun()
 
 # Transactions Tab
@@ -1841,125 +2153,122 @@ with tab2:
     if not st.session_state.real_accounts:
         st.warning("⚠️ Please fetch bank accounts from the 'Real Balances' tab first")
     else:
-        # Input parameters
-        col1, col2 = st.columns(2)
-        with col1:
-            external_transactions_per_account = st.number_input(
-                "External Transactions per Account",
-                min_value=1,
-                max_value=20,
-                value=st.session_state.external_transactions_per_account,
-                help="Number of external transactions to generate per bank account",
-                key="external_transactions_per_account_tab2"
-            )
+        st.number_input(
+            "🎲 Generation Seed",
+            min_value=0,
+            step=1,
+            help="Starts random for each session; the same seed and settings reproduce the same AP/AR/GL data on the same day",
+            key="generation_seed"
+        )
         
-        with col2:
-            date_range_days = st.number_input(
-                "Date Range (Days)",
-                min_value=1,
-                max_value=90,
-                value=30,
-                help="Number of days back to generate transactions",
-                key="date_range_days_tab2"
-            )
+        @st.fragment
+        def external_cash_section():
+            """External cash transactions: generate, review, post"""
+            # Input parameters
+            col1, col2 = st.columns(2)
+            with col1:
+                external_transactions_per_account = st.number_input(
+                    "External Transactions per Account",
+                    min_value=1,
+                    max_value=20,
+                    value=st.session_state.external_transactions_per_account,
+                    help="Number of external transactions to generate per bank account",
+                    key="external_transactions_per_account_tab2"
+                )
         
-        # Generate external transactions button
-        if external_cash_gen and st.button("Generate External Cash Transactions", type="primary", key="generate_external_btn"):
-            st.info("💳 Generating external cash transactions...")
-            
-            try:
-                # Generate external transactions
-                external_transactions = external_cash_gen.generate_external_transactions(
-                    accounts=st.session_state.real_accounts,
-                    transactions_per_account=external_transactions_per_account,
-                    date_range_days=date_range_days
+            with col2:
+                date_range_days = st.number_input(
+                    "Date Range (Days)",
+                    min_value=1,
+                    max_value=90,
+                    value=30,
+                    help="Number of days back to generate transactions",
+                    key="date_range_days_tab2"
                 )
+        
+            # Generate external transactions button
+            if external_cash_gen and st.button("Generate External Cash Transactions", type="primary", key="generate_external_btn"):
+                st.info("💳 Generating external cash transactions...")
+            
+                try:
+                    # Generate external transactions
+                    external_transactions = ExternalCashGenerator().generate_external_transactions(
+                        accounts=st.session_state.real_accounts,
+                        transactions_per_account=external_transactions_per_account,
+                        date_range_days=date_range_days
+                    )
                 
-                # Store in session state
-                st.session_state.external_transactions = external_transactions
-                st.session_state.external_transactions_per_account = external_transactions_per_account
+                    # Store in session state
+                    st.session_state.external_transactions = external_transactions
+                    st.session_state.external_transactions_per_account = external_transactions_per_account
+                    clear_prepared_downloads("external_")
                 
-                # Display transactions
-                st.subheader("📊 External Cash Transactions")
+                    # Display transactions
+                    st.subheader("📊 External Cash Transactions")
                 
-                # Create compact summary dataframe with fewer columns
-                summary_data = []
-                for transaction in external_transactions:
-                    summary_data.append({
-                        'Transaction ID': transaction['TransactionId'],
-                        'Account': transaction['AccountId'],
-                        'Description': transaction['Description'][:30] + "..." if len(transaction['Description']) > 30 else transaction['Description'],
-                        'Amount': f"${transaction['Amount']:,.2f}",
-                        'Type': transaction['Type'],
-                        'Date': transaction['TransactionDate']
-                    })
+                    # Create compact summary table with fewer columns
+                    show_table({
+                        'Reference': [t['Reference'] for t in external_transactions],
+                        'Account': truncated([t['BankAccountName'] for t in external_transactions], 30),
+                        'Amount': [t['Amount'] for t in external_transactions],
+                        'Type': [t['TransactionType'] for t in external_transactions],
+                        'Date': [t['TransactionDate'] for t in external_transactions]
+                    }, money_columns=['Amount'])
                 
-                summary_df = pd.DataFrame(summary_data)
-                st.dataframe(summary_df, use_container_width=True)
+                    # Show detailed transactions in expandable section
+                    with st.expander("📋 Detailed Transaction Information"):
+                        detailed_df = external_cash_gen.generate_dataframe(external_transactions)
+                        st.dataframe(detailed_df, use_container_width=True, hide_index=True, column_config={'Amount': MONEY_COLUMN})
                 
-                # Show detailed transactions in expandable section
-                with st.expander("📋 Detailed Transaction Information"):
-                    detailed_df = pd.DataFrame(external_transactions)
-                    st.dataframe(detailed_df, use_container_width=True)
+                    st.success(f"✅ Generated {len(external_transactions)} external cash transactions!")
                 
-                # Download section with better layout
+                except Exception as e:
+                    st.error(f"❌ Error generating external transactions: {e}")
+        
+            # Display existing transactions if available
+            external_transactions = st.session_state.get('external_transactions')
+            if external_transactions:
+                st.subheader("📋 Previously Generated External Transactions")
+                existing_df = external_cash_gen.generate_dataframe(external_transactions)
+                st.dataframe(existing_df, use_container_width=True, hide_index=True, column_config={'Amount': MONEY_COLUMN})
+            
+                # Summary statistics, reduced in numpy from one pass over the amounts
+                amounts = np.fromiter((t['Amount'] for t in external_transactions), dtype=np.float64, count=len(external_transactions))
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    total_amount = amounts.sum()
+                    st.metric("Total Amount", f"${total_amount:,.2f}")
+            
+                with col2:
+                    credit_count = int((amounts > 0).sum())
+                    st.metric("Credit Transactions", credit_count)
+            
+                with col3:
+                    debit_count = int((amounts < 0).sum())
+                    st.metric("Debit Transactions", debit_count)
+            
+                # Download files are serialized only when asked for, like the AP/AR/GL sections
                 st.markdown("---")
                 st.subheader("📥 Download Files")
-                
-                # Download buttons in columns
                 col1, col2 = st.columns(2)
-                
                 with col1:
-                    # Download CSV
-                    csv_data = external_cash_gen.generate_csv_content(external_transactions)
-                    st.download_button(
-                        label="📥 External Transactions CSV",
-                        data=csv_data,
+                    prepared_download(
+                        "External Transactions CSV",
+                        lambda: external_cash_gen.generate_csv_content(external_transactions),
                         file_name="external_cash_transactions.csv",
                         mime="text/csv",
-                        use_container_width=True
+                        key="external_csv"
                     )
-                
                 with col2:
-                    # Download Oracle Fusion format
-                    fusion_format = external_cash_gen.generate_oracle_fusion_format(external_transactions)
-                    import json
-                    fusion_json = json.dumps(fusion_format, indent=2)
-                    st.download_button(
-                        label="📥 Oracle Fusion JSON",
-                        data=fusion_json,
+                    prepared_download(
+                        "Oracle Fusion JSON",
+                        lambda: dumps_json(external_cash_gen.generate_oracle_fusion_format(external_transactions), indent=True),
                         file_name="external_transactions_fusion.json",
                         mime="application/json",
-                        use_container_width=True
+                        key="external_fusion_json"
                     )
-                
-                st.success(f"✅ Generated {len(external_transactions)} external cash transactions!")
-                
-            except Exception as e:
-                st.error(f"❌ Error generating external transactions: {e}")
-        
-        # Display existing transactions if available
-        if st.session_state.external_transactions:
-            st.subheader("📋 Previously Generated External Transactions")
-            existing_df = pd.DataFrame(st.session_state.external_transactions)
-            st.dataframe(existing_df, use_container_width=True)
-            
-            # Summary statistics
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                total_amount = sum(t['Amount'] for t in st.session_state.external_transactions)
-                st.metric("Total Amount", f"${total_amount:,.2f}")
-            
-            with col2:
-                credit_count = len([t for t in st.session_state.external_transactions if t['Amount'] > 0])
-                st.metric("Credit Transactions", credit_count)
-            
-            with col3:
-                debit_count = len([t for t in st.session_state.external_transactions if t['Amount'] < 0])
-                st.metric("Debit Transactions", debit_count)
             
-            # Post to Oracle Fusion button (only show if external transactions were generated)
-            if st.session_state.external_transactions:
+                # Post to Oracle Fusion button (only show if external transactions were generated)
                 st.markdown("---")
                 st.subheader("📤 Post to Oracle Fusion")
                 
@@ -1969,16 +2278,12 @@ with tab2:
                         st.info("📤 Posting external cash transactions to Oracle Fusion...")
                         
                         try:
-                            client = SimpleOracleClient(config)
-                            
-                            # Add authentication if provided in sidebar
-                            if 'username' in st.session_state and 'password' in st.session_state:
-                                if st.session_state.username and st.session_state.password:
-                                    client.session.auth = (st.session_state.username, st.session_state.password)
-                                    st.info("🔐 Using stored credentials")
+                            client = get_oracle_client()
+                            if client.session.auth:
+                                st.info("🔐 Using stored credentials")
                             
                             # Post to Oracle Fusion
-                            success = client.post_external_cash_transactions(st.session_state.external_transactions)
+                            success = client.post_external_cash_transactions(external_transactions)
                             
                             if success:
                                 st.success("✅ Successfully posted external cash transactions to Oracle Fusion!")
@@ -1992,141 +2297,153 @@ with tab2:
                     if st.button("🔄 Clear External Cash Data", type="secondary", key="clear_external_cash_btn"):
                         if 'external_transactions' in st.session_state:
                             del st.session_state.external_transactions
+                        clear_prepared_downloads("external_")
                         st.rerun()
+        
+        external_cash_section()
 
         # AP INVOICES SECTION (Indented inside tab2)
-        st.markdown("---")
-        st.subheader("📄 **AP INVOICES**")
-        st.markdown("Generate AP (Accounts Payable) invoices for Oracle Fusion")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            ap_invoices_per_account = st.number_input(
-                "AP Invoices per Account",
-                min_value=1,
-                max_value=10,
-                value=st.session_state.ap_invoices_per_account,
-                help="Number of AP invoices to generate per bank account",
-                key="ap_invoices_per_account_tab2"
-            )
-        with col2:
-            ap_lines_per_invoice = st.number_input(
-                "Lines per Invoice",
-                min_value=1,
-                max_value=10,
-                value=st.session_state.ap_lines_per_invoice,
-                help="Number of line items per AP invoice",
-                key="ap_lines_per_invoice_tab2"
-            )
-        with col3:
-            ap_date_range_days = st.number_input(
-                "Date Range (Days)",
-                min_value=1,
-                max_value=90,
-                value=30,
-                help="Number of days back to generate invoices",
-                key="ap_date_range_days_tab2"
-            )
-        if ap_invoice_gen and st.button("Generate AP Invoices", type="primary", key="generate_ap_btn"):
-            st.info("📄 Generating AP invoices...")
-            try:
-                ap_invoices = ap_invoice_gen.generate_ap_invoices(
-                    accounts=st.session_state.real_accounts,
-                    invoices_per_account=ap_invoices_per_account,
-                    lines_per_invoice=ap_lines_per_invoice,
-                    date_range_days=ap_date_range_days
+        @st.fragment
+        def ap_invoices_section():
+            """AP invoices: generate, review, download, post"""
+            st.markdown("---")
+            st.subheader("📄 **AP INVOICES**")
+            st.markdown("Generate AP (Accounts Payable) invoices for Oracle Fusion")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                ap_invoices_per_account = st.number_input(
+                    "AP Invoices per Account",
+                    min_value=1,
+                    max_value=10,
+                    value=st.session_state.ap_invoices_per_account,
+                    help="Number of AP invoices to generate per bank account",
+                    key="ap_invoices_per_account_tab2"
                 )
-                st.session_state.ap_invoices = ap_invoices
-                st.session_state.ap_invoices_per_account = ap_invoices_per_account
-                st.session_state.ap_lines_per_invoice = ap_lines_per_invoice
-                st.subheader("📊 AP Invoices Summary")
-                summary_data = []
-                for invoice in ap_invoices:
-                    header = invoice['header']
-                    summary_data.append({
-                        'Invoice ID': header['InvoiceId'],
-                        'Supplier': header['SupplierName'][:25] + "..." if len(header['SupplierName']) > 25 else header['SupplierName'],
-                        'Amount': f"${header['InvoiceAmount']:,.2f}",
-                        'Currency': header['Currency'],
-                        'Status': header['Status'],
-                        'Lines': len(invoice['lines'])
-                    })
-                summary_df = pd.DataFrame(summary_data)
-                st.dataframe(summary_df, use_container_width=True)
-                with st.expander("📋 Detailed Invoice Information"):
-                    detailed_data = []
-                    for invoice in ap_invoices:
+            with col2:
+                ap_lines_per_invoice = st.number_input(
+                    "Lines per Invoice",
+                    min_value=1,
+                    max_value=10,
+                    value=st.session_state.ap_lines_per_invoice,
+                    help="Number of line items per AP invoice",
+                    key="ap_lines_per_invoice_tab2"
+                )
+            with col3:
+                ap_date_range_days = st.number_input(
+                    "Date Range (Days)",
+                    min_value=1,
+                    max_value=90,
+                    value=30,
+                    help="Number of days back to generate invoices",
+                    key="ap_date_range_days_tab2"
+                )
+            if ap_invoice_gen and st.button("Generate AP Invoices", type="primary", key="generate_ap_btn"):
+                st.info("📄 Generating AP invoices...")
+                try:
+                    ap_invoices = generate_ap_invoices_cached(
+                        accounts=st.session_state.real_accounts,
+                        invoices_per_account=ap_invoices_per_account,
+                        lines_per_invoice=ap_lines_per_invoice,
+                        date_range_days=ap_date_range_days,
+                        seed=st.session_state.generation_seed,
+                        generation_date=datetime.date.today()
+                    )
+                    st.session_state.ap_invoices = ap_invoices
+                    st.session_state.ap_lines_df = ap_invoice_gen.generate_lines_dataframe(ap_invoices)
+                    clear_prepared_downloads("ap_")
+                    st.session_state.ap_invoices_per_account = ap_invoices_per_account
+                    st.session_state.ap_lines_per_invoice = ap_lines_per_invoice
+                    st.subheader("📊 AP Invoices Summary")
+                    headers = [invoice['header'] for invoice in ap_invoices]
+                    line_counts = [len(invoice['lines']) for invoice in ap_invoices]
+                    # Columns shown in both the summary and the detailed table are extracted once
+                    invoice_ids = [h['InvoiceId'] for h in headers]
+                    supplier_names = [h['SupplierName'] for h in headers]
+                    amounts = [h['InvoiceAmount'] for h in headers]
+                    currencies = [h['Currency'] for h in headers]
+                    statuses = [h['Status'] for h in headers]
+                    show_table({
+                        'Invoice ID': invoice_ids,
+                        'Supplier': truncated(supplier_names, 25),
+                        'Amount': amounts,
+                        'Currency': currencies,
+                        'Status': statuses,
+                        'Lines': line_counts
+                    }, money_columns=['Amount'])
+                    with st.expander("📋 Detailed Invoice Information"):
+                        show_table({
+                            'Invoice ID': invoice_ids,
+                            'Invoice Number': [h['InvoiceNumber'] for h in headers],
+                            'Supplier': supplier_names,
+                            'Amount': amounts,
+                            'Currency': currencies,
+                            'Invoice Date': [h['InvoiceDate'] for h in headers],
+                            'Due Date': [h['DueDate'] for h in headers],
+                            'Status': statuses,
+                            'Lines': line_counts
+                        }, money_columns=['Amount'])
+                    st.success(f"✅ Generated {len(ap_invoices)} AP invoices!")
+                except Exception as e:
+                    st.error(f"❌ Error generating AP invoices: {e}")
+            ap_invoices = st.session_state.get('ap_invoices')
+            if ap_invoices:
+                st.subheader("📋 Previously Generated AP Invoices")
+                # Amount and line totals from one pass over the invoices, reduced in numpy
+                invoice_totals = np.fromiter(
+                    ((inv['header']['InvoiceAmount'], len(inv['lines'])) for inv in ap_invoices),
+                    dtype=INVOICE_TOTALS_DTYPE,
+                    count=len(ap_invoices)
+                )
+                total_amount = invoice_totals['amount'].sum()
+                total_lines = int(invoice_totals['lines'].sum())
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    total_invoices = len(ap_invoices)
+                    st.metric("Total Invoices", total_invoices)
+                with col2:
+                    st.metric("Total Amount", f"${total_amount:,.2f}")
+                with col3:
+                    st.metric("Total Line Items", total_lines)
+                with col4:
+                    avg_amount = total_amount / total_invoices if total_invoices > 0 else 0
+                    st.metric("Average Invoice", f"${avg_amount:,.2f}")
+                if st.checkbox("📄 Show Detailed Invoice Data", key="show_ap_detail"):
+                    start, page_invoices = paginate(ap_invoices, key="ap_detail_page")
+                    for i, invoice in enumerate(page_invoices, start=start):
                         header = invoice['header']
-                        detailed_data.append({
-                            'Invoice ID': header['InvoiceId'],
-                            'Invoice Number': header['InvoiceNumber'],
-                            'Supplier': header['SupplierName'],
-                            'Amount': f"${header['InvoiceAmount']:,.2f}",
-                            'Currency': header['Currency'],
-                            'Invoice Date': header['InvoiceDate'],
-                            'Due Date': header['DueDate'],
-                            'Status': header['Status'],
-                            'Lines': len(invoice['lines'])
-                        })
-                    detailed_df = pd.DataFrame(detailed_data)
-                    st.dataframe(detailed_df, use_container_width=True)
+                        # One markdown element per invoice; the rule separates it from the previous one
+                        separator = "---\n\n" if i > start else ""
+                        st.markdown(
+                            f"{separator}**Invoice {i+1}: {header['InvoiceId']}**\n\n"
+                            f"Supplier: {header['SupplierName']} | Amount: ${header['InvoiceAmount']:,.2f}"
+                        )
+                        st.dataframe(st.session_state.ap_lines_df.loc[i:i], use_container_width=True, hide_index=True, column_config=INVOICE_LINE_COLUMNS)
                 st.markdown("---")
                 st.subheader("📥 Download Files")
                 col1, col2 = st.columns(2)
                 with col1:
-                    csv_data = ap_invoice_gen.generate_csv_content(ap_invoices)
-                    st.download_button(
-                        label="📥 AP Invoices CSV",
-                        data=csv_data,
+                    prepared_download(
+                        "AP Invoices CSV",
+                        lambda: ap_invoice_gen.generate_csv_content(ap_invoices),
                         file_name="ap_invoices_interface.csv",
                         mime="text/csv",
-                        use_container_width=True
+                        key="ap_csv"
                     )
-                    fusion_format = ap_invoice_gen.generate_oracle_fusion_format(ap_invoices)
-                    import json
-                    fusion_json = json.dumps(fusion_format, indent=2)
-                    st.download_button(
-                        label="📥 Oracle Fusion JSON",
-                        data=fusion_json,
+                    prepared_download(
+                        "Oracle Fusion JSON",
+                        lambda: dumps_json(ap_invoice_gen.generate_oracle_fusion_format(ap_invoices), indent=True),
                         file_name="ap_invoices_fusion.json",
                         mime="application/json",
-                        use_container_width=True
+                        key="ap_fusion_json"
                     )
                 with col2:
-                    properties_data = ap_invoice_gen.generate_properties_content(ap_invoices)
-                    st.download_button(
-                        label="📥 Properties File",
-                        data=properties_data,
+                    prepared_download(
+                        "Properties File",
+                        lambda: ap_invoice_gen.generate_properties_content(ap_invoices),
                         file_name="ap_invoice_import.properties",
                         mime="text/plain",
-                        use_container_width=True
+                        key="ap_properties"
                     )
-                st.success(f"✅ Generated {len(ap_invoices)} AP invoices!")
-            except Exception as e:
-                st.error(f"❌ Error generating AP invoices: {e}")
-        if st.session_state.ap_invoices:
-            st.subheader("📋 Previously Generated AP Invoices")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                total_invoices = len(st.session_state.ap_invoices)
-                st.metric("Total Invoices", total_invoices)
-            with col2:
-                total_amount = sum(inv['header']['InvoiceAmount'] for inv in st.session_state.ap_invoices)
-                st.metric("Total Amount", f"${total_amount:,.2f}")
-            with col3:
-                total_lines = sum(len(inv['lines']) for inv in st.session_state.ap_invoices)
-                st.metric("Total Line Items", total_lines)
-            with col4:
-                avg_amount = total_amount / total_invoices if total_invoices > 0 else 0
-                st.metric("Average Invoice", f"${avg_amount:,.2f}")
-            with st.expander("📄 Detailed Invoice Data"):
-                for i, invoice in enumerate(st.session_state.ap_invoices):
-                    header = invoice['header']
-                    st.write(f"**Invoice {i+1}: {header['InvoiceId']}**")
-                    st.write(f"Supplier: {header['SupplierName']} | Amount: ${header['InvoiceAmount']:,.2f}")
-                    lines_df = pd.DataFrame(invoice['lines'])
-                    st.dataframe(lines_df, use_container_width=True)
-                    st.write("---")
-            if st.session_state.ap_invoices:
                 st.markdown("---")
                 st.subheader("📤 Post to Oracle Fusion")
                 col1, col2 = st.columns(2)
@@ -2134,12 +2451,10 @@ with tab2:
                     if st.button("🚀 Post AP Invoices to Oracle Fusion", type="secondary", key="post_ap_btn"):
                         st.info("📤 Posting AP invoices to Oracle Fusion...")
                         try:
-                            client = SimpleOracleClient(config)
-                            if 'username' in st.session_state and 'password' in st.session_state:
-                                if st.session_state.username and st.session_state.password:
-                                    client.session.auth = (st.session_state.username, st.session_state.password)
-                                    st.info("🔐 Using stored credentials")
-                            success = client.post_ap_invoices(st.session_state.ap_invoices)
+                            client = get_oracle_client()
+                            if client.session.auth:
+                                st.info("🔐 Using stored credentials")
+                            success = client.post_ap_invoices(ap_invoices)
                             if success:
                                 st.success("✅ Successfully posted AP invoices to Oracle Fusion!")
                             else:
@@ -2150,187 +2465,192 @@ with tab2:
                     if st.button("🔄 Clear AP Data", type="secondary", key="clear_ap_btn"):
                         if 'ap_invoices' in st.session_state:
                             del st.session_state.ap_invoices
+                        if 'ap_lines_df' in st.session_state:
+                            del st.session_state.ap_lines_df
+                        clear_prepared_downloads("ap_")
                         st.rerun()
+        
+        ap_invoices_section()
 
         # AR INVOICES/RECEIPTS SECTION (Indented inside tab2)
-        st.markdown("---")
-        st.subheader("📋 **AR INVOICES/RECEIPTS**")
-        st.markdown("Generate AR (Accounts Receivable) invoices and receipts for Oracle Fusion")
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            ar_invoices_per_account = st.number_input(
-                "AR Invoices per Account",
-                min_value=1,
-                max_value=10,
-                value=st.session_state.ar_invoices_per_account,
-                help="Number of AR invoices to generate per bank account",
-                key="ar_invoices_per_account_tab2"
-            )
-        with col2:
-            ar_lines_per_invoice = st.number_input(
-                "Lines per Invoice",
-                min_value=1,
-                max_value=10,
-                value=st.session_state.ar_lines_per_invoice,
-                help="Number of line items per AR invoice",
-                key="ar_lines_per_invoice_tab2"
-            )
-        with col3:
-            ar_date_range_days = st.number_input(
-                "Date Range (Days)",
-                min_value=1,
-                max_value=90,
-                value=30,
-                help="Number of days back to generate invoices",
-                key="ar_date_range_days_tab2"
-            )
-        with col4:
-            receipt_percentage = st.slider(
-                "Receipt Percentage",
-                min_value=0.0,
-                max_value=1.0,
-                value=0.7,
-                step=0.1,
-                help="Percentage of invoices that will have receipts",
-                key="receipt_percentage_tab2"
-            )
-        if ar_invoice_gen and st.button("Generate AR Invoices & Receipts", type="primary", key="generate_ar_btn"):
-            st.info("📋 Generating AR invoices and receipts...")
-            try:
-                ar_invoices = ar_invoice_gen.generate_ar_invoices(
-                    accounts=st.session_state.real_accounts,
-                    invoices_per_account=ar_invoices_per_account,
-                    lines_per_invoice=ar_lines_per_invoice,
-                    date_range_days=ar_date_range_days
+        @st.fragment
+        def ar_invoices_section():
+            """AR invoices and receipts: generate, review, download, post"""
+            st.markdown("---")
+            st.subheader("📋 **AR INVOICES/RECEIPTS**")
+            st.markdown("Generate AR (Accounts Receivable) invoices and receipts for Oracle Fusion")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                ar_invoices_per_account = st.number_input(
+                    "AR Invoices per Account",
+                    min_value=1,
+                    max_value=10,
+                    value=st.session_state.ar_invoices_per_account,
+                    help="Number of AR invoices to generate per bank account",
+                    key="ar_invoices_per_account_tab2"
                 )
-                ar_receipts = ar_invoice_gen.generate_receipts(
-                    invoices=ar_invoices,
-                    receipt_percentage=receipt_percentage
+            with col2:
+                ar_lines_per_invoice = st.number_input(
+                    "Lines per Invoice",
+                    min_value=1,
+                    max_value=10,
+                    value=st.session_state.ar_lines_per_invoice,
+                    help="Number of line items per AR invoice",
+                    key="ar_lines_per_invoice_tab2"
                 )
-                st.session_state.ar_invoices = ar_invoices
-                st.session_state.ar_receipts = ar_receipts
-                st.session_state.ar_invoices_per_account = ar_invoices_per_account
-                st.session_state.ar_lines_per_invoice = ar_lines_per_invoice
-                st.subheader("📊 AR Invoices Summary")
-                summary_data = []
-                for invoice in ar_invoices:
-                    header = invoice['header']
-                    has_receipt = any(r['InvoiceId'] == header['InvoiceId'] for r in ar_receipts)
-                    summary_data.append({
-                        'Invoice ID': header['InvoiceId'],
-                        'Customer': header['CustomerName'][:25] + "..." if len(header['CustomerName']) > 25 else header['CustomerName'],
-                        'Amount': f"${header['InvoiceAmount']:,.2f}",
-                        'Currency': header['Currency'],
-                        'Status': header['Status'],
-                        'Receipt': '✅' if has_receipt else '❌'
-                    })
-                summary_df = pd.DataFrame(summary_data)
-                st.dataframe(summary_df, use_container_width=True)
-                with st.expander("📋 Detailed Invoice Information"):
-                    detailed_data = []
-                    for invoice in ar_invoices:
+            with col3:
+                ar_date_range_days = st.number_input(
+                    "Date Range (Days)",
+                    min_value=1,
+                    max_value=90,
+                    value=30,
+                    help="Number of days back to generate invoices",
+                    key="ar_date_range_days_tab2"
+                )
+            with col4:
+                receipt_percentage = st.slider(
+                    "Receipt Percentage",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=0.7,
+                    step=0.1,
+                    help="Percentage of invoices that will have receipts",
+                    key="receipt_percentage_tab2"
+                )
+            if ar_invoice_gen and st.button("Generate AR Invoices & Receipts", type="primary", key="generate_ar_btn"):
+                st.info("📋 Generating AR invoices and receipts...")
+                try:
+                    ar_invoices, ar_receipts = generate_ar_data_cached(
+                        accounts=st.session_state.real_accounts,
+                        invoices_per_account=ar_invoices_per_account,
+                        lines_per_invoice=ar_lines_per_invoice,
+                        date_range_days=ar_date_range_days,
+                        receipt_percentage=receipt_percentage,
+                        seed=st.session_state.generation_seed,
+                        generation_date=datetime.date.today()
+                    )
+                    st.session_state.ar_invoices = ar_invoices
+                    st.session_state.ar_lines_df = ar_invoice_gen.generate_lines_dataframe(ar_invoices)
+                    st.session_state.ar_receipts = ar_receipts
+                    clear_prepared_downloads("ar_")
+                    st.session_state.ar_invoices_per_account = ar_invoices_per_account
+                    st.session_state.ar_lines_per_invoice = ar_lines_per_invoice
+                    st.subheader("📊 AR Invoices Summary")
+                    headers = [invoice['header'] for invoice in ar_invoices]
+                    receipted_invoice_ids = {r['InvoiceId'] for r in ar_receipts}
+                    # Columns shown in both the summary and the detailed table are extracted once
+                    invoice_ids = [h['InvoiceId'] for h in headers]
+                    customer_names = [h['CustomerName'] for h in headers]
+                    amounts = [h['InvoiceAmount'] for h in headers]
+                    currencies = [h['Currency'] for h in headers]
+                    statuses = [h['Status'] for h in headers]
+                    show_table({
+                        'Invoice ID': invoice_ids,
+                        'Customer': truncated(customer_names, 25),
+                        'Amount': amounts,
+                        'Currency': currencies,
+                        'Status': statuses,
+                        'Receipt': ['✅' if invoice_id in receipted_invoice_ids else '❌' for invoice_id in invoice_ids]
+                    }, money_columns=['Amount'])
+                    with st.expander("📋 Detailed Invoice Information"):
+                        show_table({
+                            'Invoice ID': invoice_ids,
+                            'Invoice Number': [h['InvoiceNumber'] for h in headers],
+                            'Customer': customer_names,
+                            'Amount': amounts,
+                            'Currency': currencies,
+                            'Invoice Date': [h['InvoiceDate'] for h in headers],
+                            'Due Date': [h['DueDate'] for h in headers],
+                            'Status': statuses,
+                            'Payment Terms': [h['PaymentTerms'] for h in headers],
+                            'Lines': [len(invoice['lines']) for invoice in ar_invoices]
+                        }, money_columns=['Amount'])
+                    if ar_receipts:
+                        st.subheader("💰 AR Receipts Summary")
+                        receipt_ids = [r['ReceiptId'] for r in ar_receipts]
+                        receipt_invoice_ids = [r['InvoiceId'] for r in ar_receipts]
+                        receipt_customers = [r['CustomerName'] for r in ar_receipts]
+                        receipt_amounts = [r['Amount'] for r in ar_receipts]
+                        payment_methods = [r['PaymentMethod'] for r in ar_receipts]
+                        receipt_statuses = [r['Status'] for r in ar_receipts]
+                        show_table({
+                            'Receipt ID': receipt_ids,
+                            'Invoice ID': receipt_invoice_ids,
+                            'Customer': truncated(receipt_customers, 20),
+                            'Amount': receipt_amounts,
+                            'Payment Method': payment_methods,
+                            'Status': receipt_statuses
+                        }, money_columns=['Amount'])
+                        with st.expander("📋 Detailed Receipt Information"):
+                            show_table({
+                                'Receipt ID': receipt_ids,
+                                'Invoice ID': receipt_invoice_ids,
+                                'Customer': receipt_customers,
+                                'Amount': receipt_amounts,
+                                'Receipt Date': [r['ReceiptDate'] for r in ar_receipts],
+                                'Payment Method': payment_methods,
+                                'Status': receipt_statuses
+                            }, money_columns=['Amount'])
+                    st.success(f"✅ Generated {len(ar_invoices)} AR invoices and {len(ar_receipts)} receipts!")
+                except Exception as e:
+                    st.error(f"❌ Error generating AR invoices: {e}")
+            ar_invoices = st.session_state.get('ar_invoices')
+            if ar_invoices:
+                st.subheader("📋 Previously Generated AR Data")
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    total_invoices = len(ar_invoices)
+                    st.metric("Total Invoices", total_invoices)
+                with col2:
+                    total_amount = np.fromiter(
+                        (inv['header']['InvoiceAmount'] for inv in ar_invoices), dtype=np.float64, count=total_invoices
+                    ).sum()
+                    st.metric("Total Invoice Amount", f"${total_amount:,.2f}")
+                with col3:
+                    total_receipts = len(st.session_state.ar_receipts)
+                    st.metric("Total Receipts", total_receipts)
+                with col4:
+                    total_receipt_amount = np.fromiter(
+                        (r['Amount'] for r in st.session_state.ar_receipts), dtype=np.float64, count=total_receipts
+                    ).sum()
+                    st.metric("Total Receipt Amount", f"${total_receipt_amount:,.2f}")
+                if st.checkbox("📄 Show Detailed AR Invoice Data", key="show_ar_detail"):
+                    start, page_invoices = paginate(ar_invoices, key="ar_detail_page")
+                    for i, invoice in enumerate(page_invoices, start=start):
                         header = invoice['header']
-                        detailed_data.append({
-                            'Invoice ID': header['InvoiceId'],
-                            'Invoice Number': header['InvoiceNumber'],
-                            'Customer': header['CustomerName'],
-                            'Amount': f"${header['InvoiceAmount']:,.2f}",
-                            'Currency': header['Currency'],
-                            'Invoice Date': header['InvoiceDate'],
-                            'Due Date': header['DueDate'],
-                            'Status': header['Status'],
-                            'Payment Terms': header['PaymentTerms'],
-                            'Lines': len(invoice['lines'])
-                        })
-                    detailed_df = pd.DataFrame(detailed_data)
-                    st.dataframe(detailed_df, use_container_width=True)
-                if ar_receipts:
-                    st.subheader("💰 AR Receipts Summary")
-                    receipts_data = []
-                    for receipt in ar_receipts:
-                        receipts_data.append({
-                            'Receipt ID': receipt['ReceiptId'],
-                            'Invoice ID': receipt['InvoiceId'],
-                            'Customer': receipt['CustomerName'][:20] + "..." if len(receipt['CustomerName']) > 20 else receipt['CustomerName'],
-                            'Amount': f"${receipt['Amount']:,.2f}",
-                            'Payment Method': receipt['PaymentMethod'],
-                            'Status': receipt['Status']
-                        })
-                    receipts_df = pd.DataFrame(receipts_data)
-                    st.dataframe(receipts_df, use_container_width=True)
-                    with st.expander("📋 Detailed Receipt Information"):
-                        detailed_receipts_data = []
-                        for receipt in ar_receipts:
-                            detailed_receipts_data.append({
-                                'Receipt ID': receipt['ReceiptId'],
-                                'Invoice ID': receipt['InvoiceId'],
-                                'Customer': receipt['CustomerName'],
-                                'Amount': f"${receipt['Amount']:,.2f}",
-                                'Receipt Date': receipt['ReceiptDate'],
-                                'Payment Method': receipt['PaymentMethod'],
-                                'Status': receipt['Status']
-                            })
-                        detailed_receipts_df = pd.DataFrame(detailed_receipts_data)
-                        st.dataframe(detailed_receipts_df, use_container_width=True)
+                        separator = "---\n\n" if i > start else ""
+                        st.markdown(
+                            f"{separator}**Invoice {i+1}: {header['InvoiceId']}**\n\n"
+                            f"Customer: {header['CustomerName']} | Amount: ${header['InvoiceAmount']:,.2f} | Payment Terms: {header['PaymentTerms']}"
+                        )
+                        st.dataframe(st.session_state.ar_lines_df.loc[i:i], use_container_width=True, hide_index=True, column_config=INVOICE_LINE_COLUMNS)
                 st.markdown("---")
                 st.subheader("📥 Download Files")
                 col1, col2 = st.columns(2)
                 with col1:
-                    csv_data = ar_invoice_gen.generate_csv_content(ar_invoices)
-                    st.download_button(
-                        label="📥 AR Invoices CSV",
-                        data=csv_data,
+                    prepared_download(
+                        "AR Invoices CSV",
+                        lambda: ar_invoice_gen.generate_csv_content(ar_invoices),
                         file_name="ar_invoices_interface.csv",
                         mime="text/csv",
-                        use_container_width=True
+                        key="ar_csv"
                     )
-                    fusion_format = ar_invoice_gen.generate_oracle_fusion_format(ar_invoices)
-                    import json
-                    fusion_json = json.dumps(fusion_format, indent=2)
-                    st.download_button(
-                        label="📥 Oracle Fusion JSON",
-                        data=fusion_json,
+                    prepared_download(
+                        "Oracle Fusion JSON",
+                        lambda: dumps_json(ar_invoice_gen.generate_oracle_fusion_format(ar_invoices), indent=True),
                         file_name="ar_invoices_fusion.json",
                         mime="application/json",
-                        use_container_width=True
+                        key="ar_fusion_json"
                     )
                 with col2:
-                    if ar_receipts:
-                        receipts_csv_data = ar_invoice_gen.generate_receipts_csv_content(ar_receipts)
-                        st.download_button(
-                            label="📥 AR Receipts CSV",
-                            data=receipts_csv_data,
+                    if st.session_state.ar_receipts:
+                        prepared_download(
+                            "AR Receipts CSV",
+                            lambda: ar_invoice_gen.generate_receipts_csv_content(st.session_state.ar_receipts),
                             file_name="ar_receipts_interface.csv",
                             mime="text/csv",
-                            use_container_width=True
+                            key="ar_receipts_csv"
                         )
-                st.success(f"✅ Generated {len(ar_invoices)} AR invoices and {len(ar_receipts)} receipts!")
-            except Exception as e:
-                st.error(f"❌ Error generating AR invoices: {e}")
-        if st.session_state.ar_invoices:
-            st.subheader("📋 Previously Generated AR Data")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                total_invoices = len(st.session_state.ar_invoices)
-                st.metric("Total Invoices", total_invoices)
-            with col2:
-                total_amount = sum(inv['header']['InvoiceAmount'] for inv in st.session_state.ar_invoices)
-                st.metric("Total Invoice Amount", f"${total_amount:,.2f}")
-            with col3:
-                total_receipts = len(st.session_state.ar_receipts)
-                st.metric("Total Receipts", total_receipts)
-            with col4:
-                total_receipt_amount = sum(r['Amount'] for r in st.session_state.ar_receipts)
-                st.metric("Total Receipt Amount", f"${total_receipt_amount:,.2f}")
-            with st.expander("📄 Detailed AR Invoice Data"):
-                for i, invoice in enumerate(st.session_state.ar_invoices):
-                    header = invoice['header']
-                    st.write(f"**Invoice {i+1}: {header['InvoiceId']}**")
-                    st.write(f"Customer: {header['CustomerName']} | Amount: ${header['InvoiceAmount']:,.2f} | Payment Terms: {header['PaymentTerms']}")
-                    lines_df = pd.DataFrame(invoice['lines'])
-                    st.dataframe(lines_df, use_container_width=True)
-                    st.write("---")
-            if st.session_state.ar_invoices:
                 st.markdown("---")
                 st.subheader("📤 Post to Oracle Fusion")
                 col1, col2 = st.columns(2)
@@ -2338,12 +2658,10 @@ with tab2:
                     if st.button("🚀 Post AR Invoices to Oracle Fusion", type="secondary", key="post_ar_btn"):
                         st.info("📤 Posting AR invoices to Oracle Fusion...")
                         try:
-                            client = SimpleOracleClient(config)
-                            if 'username' in st.session_state and 'password' in st.session_state:
-                                if st.session_state.username and st.session_state.password:
-                                    client.session.auth = (st.session_state.username, st.session_state.password)
-                                    st.info("🔐 Using stored credentials")
-                            success = client.post_ar_invoices(st.session_state.ar_invoices)
+                            client = get_oracle_client()
+                            if client.session.auth:
+                                st.info("🔐 Using stored credentials")
+                            success = client.post_ar_invoices(ar_invoices)
                             if success:
                                 st.success("✅ Successfully posted AR invoices to Oracle Fusion!")
                             else:
@@ -2354,151 +2672,168 @@ with tab2:
                     if st.button("🔄 Clear AR Data", type="secondary", key="clear_ar_btn"):
                         if 'ar_invoices' in st.session_state:
                             del st.session_state.ar_invoices
+                        if 'ar_lines_df' in st.session_state:
+                            del st.session_state.ar_lines_df
                         if 'ar_receipts' in st.session_state:
                             del st.session_state.ar_receipts
+                        clear_prepared_downloads("ar_")
                         st.rerun()
+        
+        ar_invoices_section()
 
         # GL JOURNALS SECTION (Indented inside tab2)
-        st.markdown("---")
-        st.subheader("📊 **GL JOURNALS**")
-        st.markdown("Generate GL (General Ledger) journal entries for Oracle Fusion")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            gl_journals_per_account = st.number_input(
-                "GL Journals per Account",
-                min_value=1,
-                max_value=10,
-                value=st.session_state.gl_journals_per_account,
-                help="Number of GL journals to generate per bank account",
-                key="gl_journals_per_account_tab2"
-            )
-        with col2:
-            gl_lines_per_journal = st.number_input(
-                "Lines per Journal",
-                min_value=2,
-                max_value=10,
-                value=st.session_state.gl_lines_per_journal,
-                help="Number of line items per GL journal (minimum 2 for balance)",
-                key="gl_lines_per_journal_tab2"
-            )
-        with col3:
-            gl_date_range_days = st.number_input(
-                "Date Range (Days)",
-                min_value=1,
-                max_value=90,
-                value=30,
-                help="Number of days back to generate journals",
-                key="gl_date_range_days_tab2"
-            )
-        if gl_journal_gen and st.button("Generate GL Journals", type="primary", key="generate_gl_btn"):
-            st.info("📊 Generating GL journals...")
-            try:
-                gl_journals = gl_journal_gen.generate_gl_journals(
-                    accounts=st.session_state.real_accounts,
-                    journals_per_account=gl_journals_per_account,
-                    lines_per_journal=gl_lines_per_journal,
-                    date_range_days=gl_date_range_days
+        @st.fragment
+        def gl_journals_section():
+            """GL journals: generate, review, download, post"""
+            st.markdown("---")
+            st.subheader("📊 **GL JOURNALS**")
+            st.markdown("Generate GL (General Ledger) journal entries for Oracle Fusion")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                gl_journals_per_account = st.number_input(
+                    "GL Journals per Account",
+                    min_value=1,
+                    max_value=10,
+                    value=st.session_state.gl_journals_per_account,
+                    help="Number of GL journals to generate per bank account",
+                    key="gl_journals_per_account_tab2"
                 )
-                st.session_state.gl_journals = gl_journals
-                st.session_state.gl_journals_per_account = gl_journals_per_account
-                st.session_state.gl_lines_per_journal = gl_lines_per_journal
-                st.subheader("📊 GL Journals Summary")
-                summary_data = []
-                for journal in gl_journals:
-                    header = journal['header']
-                    is_balanced = abs(header['TotalDebit'] - header['TotalCredit']) < 0.01
-                    summary_data.append({
-                        'Journal ID': header['JournalId'],
-                        'Journal Name': header['JournalName'][:20] + "..." if len(header['JournalName']) > 20 else header['JournalName'],
-                        'Business Unit': header['BusinessUnit'],
-                        'Total Debit': f"${header['TotalDebit']:,.2f}",
-                        'Total Credit': f"${header['TotalCredit']:,.2f}",
-                        'Balanced': '✅' if is_balanced else '❌'
-                    })
-                summary_df = pd.DataFrame(summary_data)
-                st.dataframe(summary_df, use_container_width=True)
-                with st.expander("📋 Detailed Journal Information"):
-                    detailed_data = []
-                    for journal in gl_journals:
+            with col2:
+                gl_lines_per_journal = st.number_input(
+                    "Lines per Journal",
+                    min_value=2,
+                    max_value=10,
+                    value=st.session_state.gl_lines_per_journal,
+                    help="Number of line items per GL journal (minimum 2 for balance)",
+                    key="gl_lines_per_journal_tab2"
+                )
+            with col3:
+                gl_date_range_days = st.number_input(
+                    "Date Range (Days)",
+                    min_value=1,
+                    max_value=90,
+                    value=30,
+                    help="Number of days back to generate journals",
+                    key="gl_date_range_days_tab2"
+                )
+            if gl_journal_gen and st.button("Generate GL Journals", type="primary", key="generate_gl_btn"):
+                st.info("📊 Generating GL journals...")
+                try:
+                    gl_journals = generate_gl_journals_cached(
+                        accounts=st.session_state.real_accounts,
+                        journals_per_account=gl_journals_per_account,
+                        lines_per_journal=gl_lines_per_journal,
+                        date_range_days=gl_date_range_days,
+                        seed=st.session_state.generation_seed,
+                        generation_date=datetime.date.today()
+                    )
+                    st.session_state.gl_journals = gl_journals
+                    st.session_state.gl_lines_df = gl_journal_gen.generate_lines_dataframe(gl_journals)
+                    clear_prepared_downloads("gl_")
+                    st.session_state.gl_journals_per_account = gl_journals_per_account
+                    st.session_state.gl_lines_per_journal = gl_lines_per_journal
+                    st.subheader("📊 GL Journals Summary")
+                    headers = [journal['header'] for journal in gl_journals]
+                    total_debits = [h['TotalDebit'] for h in headers]
+                    total_credits = [h['TotalCredit'] for h in headers]
+                    # Compare whole cents exactly rather than floats within an epsilon
+                    debit_cents = np.rint(np.array(total_debits) * 100).astype(np.int64)
+                    credit_cents = np.rint(np.array(total_credits) * 100).astype(np.int64)
+                    balanced = (debit_cents == credit_cents).tolist()
+                    journal_ids = [h['JournalId'] for h in headers]
+                    journal_names = [h['JournalName'] for h in headers]
+                    business_units = [h['BusinessUnit'] for h in headers]
+                    show_table({
+                        'Journal ID': journal_ids,
+                        'Journal Name': truncated(journal_names, 20),
+                        'Business Unit': business_units,
+                        'Total Debit': total_debits,
+                        'Total Credit': total_credits,
+                        'Balanced': ['✅' if is_balanced else '❌' for is_balanced in balanced]
+                    }, money_columns=['Total Debit', 'Total Credit'])
+                    with st.expander("📋 Detailed Journal Information"):
+                        show_table({
+                            'Journal ID': journal_ids,
+                            'Journal Name': journal_names,
+                            'Journal Type': [h['JournalType'] for h in headers],
+                            'Business Unit': business_units,
+                            'Ledger': [h['Ledger'] for h in headers],
+                            'Currency': [h['Currency'] for h in headers],
+                            'Total Debit': total_debits,
+                            'Total Credit': total_credits,
+                            'Lines': [len(journal['lines']) for journal in gl_journals],
+                            'Balanced': ['✅ Yes' if is_balanced else '❌ No' for is_balanced in balanced]
+                        }, money_columns=['Total Debit', 'Total Credit'])
+                    st.success(f"✅ Generated {len(gl_journals)} GL journals!")
+                except Exception as e:
+                    st.error(f"❌ Error generating GL journals: {e}")
+            gl_journals = st.session_state.get('gl_journals')
+            if gl_journals:
+                st.subheader("📋 Previously Generated GL Journals")
+                # Debit, credit and line totals from one pass over the journals, reduced in numpy
+                journal_totals = np.fromiter(
+                    ((journal['header']['TotalDebit'], journal['header']['TotalCredit'], len(journal['lines'])) for journal in gl_journals),
+                    dtype=JOURNAL_TOTALS_DTYPE,
+                    count=len(gl_journals)
+                )
+                # Balances are checked in whole cents, so float rounding cannot mask or fake a mismatch
+                debit_cents = np.rint(journal_totals['debit'] * 100).astype(np.int64)
+                credit_cents = np.rint(journal_totals['credit'] * 100).astype(np.int64)
+                all_balanced = bool((debit_cents == credit_cents).all())
+                total_debit = debit_cents.sum() / 100
+                total_credit = credit_cents.sum() / 100
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    total_journals = len(gl_journals)
+                    st.metric("Total Journals", total_journals)
+                with col2:
+                    total_lines = int(journal_totals['lines'].sum())
+                    st.metric("Total Lines", total_lines)
+                with col3:
+                    st.metric("Total Debit", f"${total_debit:,.2f}")
+                with col4:
+                    st.metric("Total Credit", f"${total_credit:,.2f}")
+                if all_balanced:
+                    st.success("✅ All journals are balanced!")
+                else:
+                    st.error("❌ Journals are not balanced!")
+                if st.checkbox("📄 Show Detailed GL Journal Data", key="show_gl_detail"):
+                    start, page_journals = paginate(gl_journals, key="gl_detail_page")
+                    for i, journal in enumerate(page_journals, start=start):
                         header = journal['header']
-                        is_balanced = abs(header['TotalDebit'] - header['TotalCredit']) < 0.01
-                        detailed_data.append({
-                            'Journal ID': header['JournalId'],
-                            'Journal Name': header['JournalName'],
-                            'Journal Type': header['JournalType'],
-                            'Business Unit': header['BusinessUnit'],
-                            'Ledger': header['Ledger'],
-                            'Currency': header['Currency'],
-                            'Total Debit': f"${header['TotalDebit']:,.2f}",
-                            'Total Credit': f"${header['TotalCredit']:,.2f}",
-                            'Lines': len(journal['lines']),
-                            'Balanced': '✅ Yes' if is_balanced else '❌ No'
-                        })
-                    detailed_df = pd.DataFrame(detailed_data)
-                    st.dataframe(detailed_df, use_container_width=True)
+                        separator = "---\n\n" if i > start else ""
+                        st.markdown(
+                            f"{separator}**Journal {i+1}: {header['JournalId']}**\n\n"
+                            f"Type: {header['JournalType']} | Business Unit: {header['BusinessUnit']} | Ledger: {header['Ledger']}\n\n"
+                            f"Total Debit: ${header['TotalDebit']:,.2f} | Total Credit: ${header['TotalCredit']:,.2f}"
+                        )
+                        st.dataframe(st.session_state.gl_lines_df.loc[i:i], use_container_width=True, hide_index=True, column_config=JOURNAL_LINE_COLUMNS)
                 st.markdown("---")
                 st.subheader("📥 Download Files")
                 col1, col2 = st.columns(2)
                 with col1:
-                    csv_data = gl_journal_gen.generate_csv_content(gl_journals)
-                    st.download_button(
-                        label="📥 GL Journals CSV",
-                        data=csv_data,
+                    prepared_download(
+                        "GL Journals CSV",
+                        lambda: gl_journal_gen.generate_csv_content(gl_journals),
                         file_name="gl_journals_interface.csv",
                         mime="text/csv",
-                        use_container_width=True
+                        key="gl_csv"
                     )
-                    fusion_format = gl_journal_gen.generate_oracle_fusion_format(gl_journals)
-                    import json
-                    fusion_json = json.dumps(fusion_format, indent=2)
-                    st.download_button(
-                        label="📥 Oracle Fusion JSON",
-                        data=fusion_json,
+                    prepared_download(
+                        "Oracle Fusion JSON",
+                        lambda: dumps_json(gl_journal_gen.generate_oracle_fusion_format(gl_journals), indent=True),
                         file_name="gl_journals_fusion.json",
                         mime="application/json",
-                        use_container_width=True
+                        key="gl_fusion_json"
                     )
                 with col2:
-                    properties_data = gl_journal_gen.generate_properties_content(gl_journals)
-                    st.download_button(
-                        label="📥 Properties File",
-                        data=properties_data,
+                    prepared_download(
+                        "Properties File",
+                        lambda: gl_journal_gen.generate_properties_content(gl_journals),
                         file_name="gl_journal_import.properties",
                         mime="text/plain",
-                        use_container_width=True
+                        key="gl_properties"
                     )
-                st.success(f"✅ Generated {len(gl_journals)} GL journals!")
-            except Exception as e:
-                st.error(f"❌ Error generating GL journals: {e}")
-        if st.session_state.gl_journals:
-            st.subheader("📋 Previously Generated GL Journals")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                total_journals = len(st.session_state.gl_journals)
-                st.metric("Total Journals", total_journals)
-            with col2:
-                total_lines = sum(len(journal['lines']) for journal in st.session_state.gl_journals)
-                st.metric("Total Lines", total_lines)
-            with col3:
-                total_debit = sum(journal['header']['TotalDebit'] for journal in st.session_state.gl_journals)
-                st.metric("Total Debit", f"${total_debit:,.2f}")
-            with col4:
-                total_credit = sum(journal['header']['TotalCredit'] for journal in st.session_state.gl_journals)
-                st.metric("Total Credit", f"${total_credit:,.2f}")
-            if abs(total_debit - total_credit) < 0.01:
-                st.success("✅ All journals are balanced!")
-            else:
-                st.error("❌ Journals are not balanced!")
-            with st.expander("📄 Detailed GL Journal Data"):
-                for i, journal in enumerate(st.session_state.gl_journals):
-                    header = journal['header']
-                    st.write(f"**Journal {i+1}: {header['JournalId']}**")
-                    st.write(f"Type: {header['JournalType']} | Business Unit: {header['BusinessUnit']} | Ledger: {header['Ledger']}")
-                    st.write(f"Total Debit: ${header['TotalDebit']:,.2f} | Total Credit: ${header['TotalCredit']:,.2f}")
-                    lines_df = pd.DataFrame(journal['lines'])
-                    st.dataframe(lines_df, use_container_width=True)
-                    st.write("---")
-            if st.session_state.gl_journals:
                 st.markdown("---")
                 st.subheader("📤 Post to Oracle Fusion")
                 col1, col2 = st.columns(2)
@@ -2506,12 +2841,10 @@ with tab2:
                     if st.button("🚀 Post GL Journals to Oracle Fusion", type="secondary", key="post_gl_btn"):
                         st.info("📤 Posting GL journals to Oracle Fusion...")
                         try:
-                            client = SimpleOracleClient(config)
-                            if 'username' in st.session_state and 'password' in st.session_state:
-                                if st.session_state.username and st.session_state.password:
-                                    client.session.auth = (st.session_state.username, st.session_state.password)
-                                    st.info("🔐 Using stored credentials")
-                            success = client.post_gl_journals(st.session_state.gl_journals)
+                            client = get_oracle_client()
+                            if client.session.auth:
+                                st.info("🔐 Using stored credentials")
+                            success = client.post_gl_journals(gl_journals)
                             if success:
                                 st.success("✅ Successfully posted GL journals to Oracle Fusion!")
                             else:
@@ -2522,4 +2855,9 @@ with tab2:
                     if st.button("🔄 Clear GL Data", type="secondary", key="clear_gl_btn"):
                         if 'gl_journals' in st.session_state:
                             del st.session_state.gl_journals
+                        if 'gl_lines_df' in st.session_state:
+                            del st.session_state.gl_lines_df
+                        clear_prepared_downloads("gl_")
                         st.rerun()
+        
+        gl_journals_section()